@@ -0,0 +1,162 @@
+# ==========================================
+# [시온이네 일기장] 백그라운드 책 만들기
+# ==========================================
+# 1. 버튼을 누르면 책 만들기(가져오기 → 굽기)를 작업 스레드에 맡기고 바로 돌아옴
+#    -> Streamlit 스크립트 스레드를 붙잡지 않음
+# 2. 작업은 프로세스 전체에서 공유하는 JobManager 에 job_id 로 보관
+#    -> 새로고침/재접속해도 URL 의 job_id 로 다시 찾아서 진행 상황/결과를 보여줌
+# 3. 진행 상황: 캘린더별 가져오기 완료 여부(report.calendars), 구운 날짜 수(on_progress)
+# 4. 끝난 작업은 KEEP_SEC 동안 보관한 뒤 출력 폴더와 함께 지움
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from calendar_fetch import get_events_from_ids
+from diary_render import warm_up_renderer, write_volumes, zip_volumes
+from html_export import export_book
+from instrument import GenerationReport
+
+MAX_JOB_WORKERS = 2     # 동시에 만들 책 수 (굽기 자체는 렌더링 프로세스 풀이 나눠 맡음)
+KEEP_SEC = 2 * 3600     # 끝난 작업(과 PDF 파일)을 보관하는 시간
+
+class BookJob:
+    """책 한 권 만들기 작업의 상태. 작업 스레드가 쓰고, 화면(스크립트 스레드)이 읽는다."""
+
+    def __init__(self, job_id, calendar_ids):
+        self.job_id = job_id
+        self.calendar_ids = list(calendar_ids)
+        self.report = GenerationReport()
+        self.status = 'queued'      # queued → fetching → rendering → done / failed
+        self.total_days = 0
+        self.rendered_days = 0
+        self.total_count = 0
+        self.logs = []
+        self.volumes = []
+        self.zip_path = None
+        self.error = None
+        self.out_dir = None
+        self.finished_at = None
+        self.discarded = False
+        self._lock = threading.Lock()
+
+    def _update(self, **fields):
+        with self._lock:
+            for key, value in fields.items(): setattr(self, key, value)
+
+    def _finish(self, status, **fields):
+        # 끝난 상태와 끝난 시각을 한 번에 바꿈 (finished_at 없이 끝난 작업이 보이지 않도록)
+        with self._lock:
+            for key, value in fields.items(): setattr(self, key, value)
+            self.finished_at = time.time()  # _prune 은 잠금 없이 status 를 먼저 보므로 시각을 먼저 넣음
+            self.status = status
+
+    def _add_rendered(self, days):
+        with self._lock:
+            self.rendered_days = min(self.total_days, self.rendered_days + days)
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'failed')
+
+    def progress(self):
+        """화면에 보여줄 진행 상황 dict (스냅샷)."""
+        fetched = self.report.to_dict()['calendars']
+        with self._lock:
+            return {
+                'status': self.status,
+                'calendars_total': len(self.calendar_ids),
+                'calendars_done': [cal_id for cal_id in self.calendar_ids if 'sec' in fetched.get(cal_id, {})],
+                'days_total': self.total_days,
+                'days_done': self.rendered_days,
+                'error': self.error,
+            }
+
+def _run_book_job(job, service, params, store=None, page_cache=None):
+    try:
+        job._update(status='fetching')
+        daily_data, cal_legend_info, logs = get_events_from_ids(
+            service, params['calendar_ids'], params['custom_colors'], params['start'], params['end'],
+            store=store, report=job.report,
+        )
+        total_count = sum(len(v['allday']) + len(v['timed']) for v in daily_data.values())
+        days = sum(1 for v in daily_data.values() if v['allday'] or v['timed'])
+        job._update(logs=logs, total_count=total_count, total_days=days)
+        if total_count == 0:
+            job._finish('done')
+            return
+
+        job._update(status='rendering', out_dir=tempfile.mkdtemp(prefix="diary-"))
+        fmt = params.get('format', 'pdf')
+        if fmt != 'pdf':
+            # 훑어보기용 HTML 묶음/EPUB: WeasyPrint 없이 하루씩 파일로
+            volumes = export_book(fmt, daily_data, cal_legend_info, params['calendar_ids'], job.out_dir,
+                                  params['font_scale'], report=job.report, on_progress=job._add_rendered)
+            job._finish('done', volumes=volumes, rendered_days=days)
+            return
+        volumes = write_volumes(daily_data, cal_legend_info, params['calendar_ids'], job.out_dir,
+                                params['font_scale'], params['volume_by'], page_cache=page_cache,
+                                report=job.report, on_progress=job._add_rendered,
+                                summary=params.get('summary', False))
+        zip_path = zip_volumes(volumes, os.path.join(job.out_dir, "MyDiary.zip")) if len(volumes) > 1 else None
+        job._finish('done', volumes=volumes, zip_path=zip_path, rendered_days=days)
+    except Exception as e:
+        job._finish('failed', error=str(e))
+    finally:
+        job.report.log(job=job.job_id)
+
+class JobManager:
+    """프로세스 전체에서 하나 (app.py 에서 st.cache_resource 로 공유)."""
+
+    def __init__(self, max_workers=MAX_JOB_WORKERS, keep_sec=KEEP_SEC):
+        self.keep_sec = keep_sec
+        self.max_workers = max_workers
+        # 작업 스레드는 오래 살아 있으므로 시작할 때 렌더러(폰트/CSS)를 미리 준비해 둠 (warm_up 참고)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='diary-job',
+                                            initializer=warm_up_renderer)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        """작업 스레드를 지금 다 띄워서 렌더러를 준비시킨다 (기다리지 않음).
+
+        스레드 풀은 작업이 들어올 때 스레드를 띄우고 initializer 도 그때 돌기 때문에,
+        그냥 두면 준비 비용을 첫 책이 냄.
+        """
+        for _ in range(self.max_workers):
+            self._executor.submit(time.sleep, 0)
+
+    def submit(self, service, params, store=None, page_cache=None):
+        """params: calendar_ids, custom_colors, start, end, font_scale, volume_by, summary, format. job_id 를 돌려줌."""
+        self._prune()
+        job = BookJob(uuid.uuid4().hex[:12], params['calendar_ids'])
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._executor.submit(_run_book_job, job, service, params, store, page_cache)
+        return job.job_id
+
+    def get(self, job_id):
+        if not job_id: return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def discard(self, job_id):
+        """더 이상 안 볼 작업 (같은 세션에서 새 책을 만들 때). 아직 도는 중이면 끝난 뒤 정리."""
+        job = self.get(job_id)
+        if job is None: return
+        job.discarded = True
+        self._prune()
+
+    def _prune(self):
+        now = time.time()
+        with self._lock:
+            expired = [job for job in self._jobs.values()
+                       if job.finished and (job.discarded or now - job.finished_at > self.keep_sec)]
+            for job in expired:
+                del self._jobs[job.job_id]
+        for job in expired:
+            if job.out_dir: shutil.rmtree(job.out_dir, ignore_errors=True)
@@ -0,0 +1,233 @@
+# ==========================================
+# [시온이네 일기장] 배치 인쇄소 (Streamlit 없이 명령줄에서)
+# ==========================================
+# 1. 설정 파일(JSON)에 적힌 책(작업)들을 한 번에 만든다 (예: 여러 가족의 지난달 일기책을 밤새 굽기)
+# 2. 가져오기는 스레드 풀, PDF 굽기는 프로세스 풀에서 동시에 돌림
+#    -> 먼저 다 가져온 책부터 바로 굽기 시작함
+# 3. 화면(app.py)과 같은 get_events_from_ids / write_volumes 를 그대로 씀
+#
+#   python batch_print.py jobs.json
+#   python batch_print.py jobs.json --workers 4 --only sion haon
+#
+# 설정 파일 예시:
+#   {
+#     "service_account": "robot.json",        // 없으면 GOOGLE_APPLICATION_CREDENTIALS
+#     "out_dir": "out",                       // 상대 경로는 설정 파일 기준
+#     "font_scale": 1.0,                      // 모든 작업의 기본값
+#     "jobs": [
+#       {"name": "sion", "calendars": ["abc@group.calendar.google.com | red", "def@group..."],
+#        "month": "previous"},                // 지난달 ("2026-09" 처럼 직접 적어도 됨)
+#       {"name": "haon", "calendars": "ghi@group... | 4285f4",
+#        "start": "2026-01-01", "end": "2026-06-30", "font_scale": 1.1, "volume_by": "month",
+#        "summary": true,                      // 맨 앞에 요약 페이지 (numpy 필요)
+#        "priority": ["ghi@group..."]},         // 여러 캘린더에 같이 있는 일정은 이 순서로 색을 정함 (기본: calendars 순서)
+#       {"name": "archive", "calendars": ["abc@group..."], "start": "2016-01-01", "end": "2025-12-31",
+#        "format": "html"}                    // 훑어보기용 HTML 묶음 ("epub" 도 가능, 기본 "pdf")
+#     ]
+#   }
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+
+import diary_render
+from calendar_fetch import build_calendar_service, get_events_from_ids, parse_calendar_ids
+from diary_render import FONT_SCALE, choose_volume_by, warm_up_renderer, write_volumes, zip_volumes
+from event_store import EventStore
+from html_export import EXPORT_FORMATS, export_book
+from instrument import GenerationReport
+from page_cache import DEFAULT_PAGE_CACHE_DIR, PageCache
+
+DEFAULT_WORKERS = max(1, min(4, os.cpu_count() or 1))
+VOLUME_CHOICES = (None, 'month', 'quarter')
+FORMAT_CHOICES = ('pdf', *EXPORT_FORMATS)
+
+# --- [1. 설정 파일 읽기] ---
+class JobConfigError(ValueError):
+    pass
+
+def _month_range(value, today):
+    if value == 'previous':
+        last = today.replace(day=1) - timedelta(days=1)
+        return last.replace(day=1), last
+    if value == 'current':
+        first = today.replace(day=1)
+    else:
+        try:
+            year, month = (int(x) for x in value.split('-'))
+            first = date(year, month, 1)
+        except ValueError:
+            raise JobConfigError(f"month 는 'YYYY-MM', 'previous', 'current' 중 하나여야 합니다: {value!r}")
+    next_first = (first + timedelta(days=32)).replace(day=1)
+    return first, next_first - timedelta(days=1)
+
+def _job_dates(spec, today):
+    if 'month' in spec: return _month_range(spec['month'], today)
+    try:
+        return date.fromisoformat(spec['start']), date.fromisoformat(spec['end'])
+    except KeyError:
+        raise JobConfigError(f"[{spec.get('name')}] month 또는 start/end 가 필요합니다.")
+    except ValueError as e:
+        raise JobConfigError(f"[{spec.get('name')}] 날짜 형식 오류: {e}")
+
+def load_jobs(config, today=None):
+    """설정 dict 의 jobs 를 검사해서 작업 dict 목록으로 바꾼다. 잘못된 설정은 JobConfigError."""
+    today = today or date.today()
+    default_scale = config.get('font_scale', FONT_SCALE)
+    jobs = []
+    names = set()
+    for i, spec in enumerate(config.get('jobs', [])):
+        name = spec.get('name') or f"job{i + 1}"
+        if name in names: raise JobConfigError(f"작업 이름이 겹칩니다: {name}")
+        names.add(name)
+        calendar_ids, custom_colors = parse_calendar_ids(spec.get('calendars', []))
+        if not calendar_ids: raise JobConfigError(f"[{name}] calendars 가 비어 있습니다.")
+        start_d, end_d = _job_dates({**spec, 'name': name}, today)
+        if start_d > end_d: raise JobConfigError(f"[{name}] 시작 날짜가 종료 날짜보다 늦습니다.")
+        priority = spec.get('priority', [])
+        if not isinstance(priority, list): raise JobConfigError(f"[{name}] priority 는 캘린더 ID 목록이어야 합니다.")
+        fmt = spec.get('format', 'pdf')
+        if fmt not in FORMAT_CHOICES: raise JobConfigError(f"[{name}] format 은 {'/'.join(FORMAT_CHOICES)} 중 하나: {fmt!r}")
+        volume_by = spec.get('volume_by', choose_volume_by((end_d - start_d).days + 1))
+        if volume_by not in VOLUME_CHOICES: raise JobConfigError(f"[{name}] volume_by 는 month/quarter/null 중 하나: {volume_by!r}")
+        jobs.append({
+            'name': name,
+            'calendar_ids': calendar_ids,
+            'custom_colors': custom_colors,
+            'start': start_d,
+            'end': end_d,
+            'font_scale': float(spec.get('font_scale', default_scale)),
+            'volume_by': volume_by,
+            'summary': bool(spec.get('summary', config.get('summary', False))),
+            'priority': [cal_id.strip() for cal_id in priority],
+            'format': fmt,
+        })
+    if not jobs: raise JobConfigError("jobs 가 비어 있습니다.")
+    return jobs
+
+def load_service_account(config, base_dir):
+    path = config.get('service_account') or os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
+    if not path: raise JobConfigError("service_account 경로 또는 GOOGLE_APPLICATION_CREDENTIALS 가 필요합니다.")
+    with open(os.path.join(base_dir, path), encoding='utf-8') as f:
+        return json.load(f)
+
+# --- [2. 작업 실행] ---
+def fetch_job(service, job, store=None):
+    """(스레드 풀에서) 한 작업의 일정을 가져온다. (daily_data, 범례, 로그, report) 를 돌려줌."""
+    report = GenerationReport()
+    daily_data, cal_legend_info, logs = get_events_from_ids(
+        service, job['calendar_ids'], job['custom_colors'], job['start'], job['end'], store=store, report=report,
+        priority=job['priority'],
+    )
+    return daily_data, cal_legend_info, logs, report
+
+def render_job(job, daily_data, cal_legend_info, out_dir, page_cache_dir=None):
+    """(프로세스 풀에서) 한 작업의 책을 out_dir/<이름>/ 에 굽는다. (권 목록, zip 경로, 단계 기록) 을 돌려줌."""
+    # 작업끼리 이미 프로세스를 나눠 쓰고 있으므로 워커 안에서 렌더링 풀을 또 띄우지 않음
+    diary_render.RENDER_WORKERS = 1
+    job_dir = os.path.join(out_dir, job['name'])
+    os.makedirs(job_dir, exist_ok=True)
+    report = GenerationReport()
+    if job['format'] != 'pdf':
+        volumes = export_book(job['format'], daily_data, cal_legend_info, job['calendar_ids'], job_dir,
+                              job['font_scale'], report=report)
+        return volumes, None, report.to_dict()['stages']
+    page_cache = PageCache(page_cache_dir) if page_cache_dir else None
+    volumes = write_volumes(daily_data, cal_legend_info, job['calendar_ids'], job_dir, job['font_scale'],
+                            job['volume_by'], file_prefix="MyDiary", page_cache=page_cache, report=report,
+                            summary=job['summary'])
+    zip_path = zip_volumes(volumes, os.path.join(job_dir, "MyDiary.zip")) if len(volumes) > 1 else None
+    return volumes, zip_path, report.to_dict()['stages']
+
+def run_jobs(service, jobs, out_dir, workers=DEFAULT_WORKERS, store=None, page_cache_dir=None):
+    """작업들을 동시에 실행하고 작업마다 결과 dict 를 돌려준다 (실패한 작업은 'error' 가 채워짐)."""
+    results = {job['name']: {'name': job['name'], 'volumes': [], 'zip_path': None, 'events': 0, 'logs': [], 'error': None}
+               for job in jobs}
+    reports = {}
+    spawn = multiprocessing.get_context('spawn')
+    with ThreadPoolExecutor(max_workers=workers) as fetchers, \
+         ProcessPoolExecutor(max_workers=workers, mp_context=spawn, initializer=warm_up_renderer) as renderers:
+        fetching = {fetchers.submit(fetch_job, service, job, store): job for job in jobs}
+        rendering = {}
+        for future in as_completed(fetching):
+            job = fetching[future]
+            result = results[job['name']]
+            try:
+                daily_data, cal_legend_info, result['logs'], reports[job['name']] = future.result()
+            except Exception as e:
+                result['error'] = f"가져오기 실패: {e}"
+                continue
+            result['events'] = sum(len(v['allday']) + len(v['timed']) for v in daily_data.values())
+            if result['events'] == 0:
+                result['error'] = "가져온 일기가 없습니다."
+                continue
+            rendering[renderers.submit(render_job, job, daily_data, cal_legend_info, out_dir, page_cache_dir)] = job
+
+        for future in as_completed(rendering):
+            job = rendering[future]
+            result = results[job['name']]
+            try:
+                result['volumes'], result['zip_path'], stages = future.result()
+            except Exception as e:
+                result['error'] = f"굽기 실패: {e}"
+                continue
+            for name, entry in stages.items():
+                reports[job['name']].add(name, **entry)
+
+    for name, report in reports.items():
+        report.log(job=name)
+    return [results[job['name']] for job in jobs]
+
+# --- [3. 명령줄] ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="설정 파일에 적힌 일기책들을 한 번에 굽습니다.")
+    parser.add_argument('config', help="작업 설정 JSON 파일")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="동시에 만들 책 수")
+    parser.add_argument('--out-dir', help="출력 폴더 (설정 파일의 out_dir 보다 우선)")
+    parser.add_argument('--only', nargs='+', metavar='NAME', help="이 이름의 작업만 실행")
+    parser.add_argument('--no-store', action='store_true', help="로컬 일정 저장소(SQLite) 없이 바로 가져오기")
+    parser.add_argument('--no-page-cache', action='store_true', help="페이지 캐시 없이 굽기")
+    parser.add_argument('-v', '--verbose', action='store_true', help="단계별 JSON 로그 출력")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+    base_dir = os.path.dirname(os.path.abspath(args.config))
+    try:
+        with open(args.config, encoding='utf-8') as f:
+            config = json.load(f)
+        jobs = load_jobs(config)
+        if args.only:
+            jobs = [job for job in jobs if job['name'] in args.only]
+            if not jobs: raise JobConfigError(f"--only 에 맞는 작업이 없습니다: {', '.join(args.only)}")
+        service, robot_email = build_calendar_service(load_service_account(config, base_dir))
+    except (OSError, ValueError) as e:
+        print(f"❌ 설정 오류: {e}", file=sys.stderr)
+        return 2
+
+    out_dir = args.out_dir or os.path.join(base_dir, config.get('out_dir', 'out'))
+    print(f"🤖 {robot_email} 로 {len(jobs)}권 작업 시작 (동시 {args.workers}개)")
+    results = run_jobs(
+        service, jobs, out_dir, workers=args.workers,
+        store=None if args.no_store else EventStore(),
+        page_cache_dir=None if args.no_page_cache else DEFAULT_PAGE_CACHE_DIR,
+    )
+
+    failed = 0
+    for result in results:
+        for log in result['logs']:
+            if "❌" in log or "⚠️" in log: print(f"   [{result['name']}] {log}")
+        if result['error']:
+            failed += 1
+            print(f"❌ [{result['name']}] {result['error']}")
+            continue
+        files = result['zip_path'] or result['volumes'][0]['path']
+        print(f"✅ [{result['name']}] 일기 {result['events']}개, {len(result['volumes'])}권 → {files}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,36 @@
+# ==========================================
+# [벤치마크] 긴 기간 내보내기 (HTML 묶음 / EPUB)
+# ==========================================
+# 사용법: python benchmarks/bench_export.py [년 수] [하루 일정 수]
+# 여러 해짜리 daily_data 를 html_export 로 내보내고 걸린 시간, 파일 크기, 최대 메모리를 출력한다.
+# 하루씩 바로 파일로 쓰므로 기간을 늘려도 최대 메모리는 거의 그대로여야 함.
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_html import make_daily_data
+from html_export import EXPORT_FORMATS, export_book
+from instrument import peak_rss_mb
+
+if __name__ == '__main__':
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    daily_data = make_daily_data(365 * years, per_day)
+    legend = {'cal': {'name': '가족', 'color': '#7986cb'}}
+    out_dir = tempfile.mkdtemp(prefix="diary-export-")
+    print(f"{years}년 x 하루 {per_day}개 (데이터 만든 뒤 최대 메모리 {peak_rss_mb():.0f}MB)")
+    try:
+        for fmt in EXPORT_FORMATS:
+            t0 = time.perf_counter()
+            volumes = export_book(fmt, daily_data, legend, ['cal'], out_dir)
+            size = os.path.getsize(volumes[0]['path'])
+            print(f"  {fmt:5s}: {time.perf_counter() - t0:6.2f}초, {size / (1024 * 1024):6.1f}MB, "
+                  f"최대 메모리 {peak_rss_mb():.0f}MB")
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
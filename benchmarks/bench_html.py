@@ -0,0 +1,63 @@
+# ==========================================
+# [벤치마크] 365일치 HTML 생성 시간
+# ==========================================
+# 사용법: python benchmarks/bench_html.py [일수] [하루 일정 수]
+# 합성 일정으로 build_book_html(리스트에 모아서 한 번 join)과
+# 예전 방식(하루치 문자열을 += 로 이어붙이기)을 비교한다.
+
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_model import KST, Event
+from diary_render import build_book_html, generate_day_html
+
+def make_daily_data(num_days, events_per_day, seed=42):
+    rng = random.Random(seed)
+    start = date(2026, 1, 1)
+    daily_data = {}
+    for i in range(num_days):
+        d = start + timedelta(days=i)
+        day_start = datetime.combine(d, datetime.min.time()).replace(tzinfo=KST)
+        timed = []
+        for j in range(events_per_day):
+            s = day_start + timedelta(minutes=rng.randint(0, 1380))
+            timed.append(Event('cal', '가족', '#7986cb', f"일정 {j}", "오늘의 기록 " * rng.randint(0, 40),
+                               False, s, s + timedelta(minutes=rng.randint(15, 180))))
+        timed.sort(key=lambda x: x.start)
+        allday = [Event('cal', '가족', '#33b679', '여행', '', True, d, d + timedelta(days=1))] if i % 7 == 0 else []
+        daily_data[d] = {'allday': allday, 'timed': timed}
+    return daily_data
+
+def concat_book_html(daily_data, cal_legend_info, ordered_ids):
+    full_html = "<html><body>"
+    for d, events in sorted(daily_data.items()):
+        full_html += generate_day_html(d, events, cal_legend_info, ordered_ids)
+    full_html += "</body></html>"
+    return full_html
+
+def best_of(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+if __name__ == '__main__':
+    num_days = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+    events_per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    daily_data = make_daily_data(num_days, events_per_day)
+    legend = {'cal': {'name': '가족', 'color': '#7986cb'}}
+
+    t_concat, html_a = best_of(lambda: concat_book_html(daily_data, legend, ['cal']))
+    t_builder, html_b = best_of(lambda: build_book_html(daily_data, legend, ['cal']))
+    assert html_a == html_b
+
+    print(f"{num_days}일 x {events_per_day}개, HTML {len(html_b) / 1e6:.1f}MB")
+    print(f"  += 이어붙이기 : {t_concat * 1000:8.1f} ms")
+    print(f"  빌더(join)    : {t_builder * 1000:8.1f} ms")
@@ -0,0 +1,46 @@
+# ==========================================
+# [벤치마크] 앱 첫 실행(콜드 스타트) import 시간
+# ==========================================
+# 사용법: python benchmarks/bench_import.py [모듈 ...]
+# 새 파이썬 프로세스에서 `python -X importtime -c "import ..."` 로 app.py 가 불러오는 모듈들을 import 하고,
+#  - 전체 import 시간
+#  - 오래 걸린 모듈 상위 N개 (누적 시간)
+#  - 첫 화면에서 불리면 안 되는 무거운 모듈(WeasyPrint, 구글 API 클라이언트)이 끌려 왔는지
+# 를 출력한다. 무거운 모듈이 보이면 종료 코드 1 (CI 에서 콜드 스타트 회귀를 잡을 때 씀).
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_MODULES = ['streamlit', 'background_jobs', 'calendar_fetch', 'diary_render', 'event_store', 'page_cache']
+HEAVY_MODULES = ('weasyprint', 'googleapiclient', 'google.oauth2', 'google_auth_httplib2', 'numpy', 'pypdf')
+TOP_N = 15
+
+def import_times(modules):
+    """[(모듈 이름, 자기 시간 us, 누적 시간 us, 깊이)] 를 import 된 순서대로 돌려준다."""
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line: continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+if __name__ == '__main__':
+    modules = sys.argv[1:] or APP_MODULES
+    rows = import_times(modules)
+    total = sum(cumulative for _, _, cumulative, depth in rows if depth == 0)
+    print(f"import {', '.join(modules)}: {total / 1000:.0f} ms ({len(rows)}개 모듈)")
+    for name, _, cumulative, _ in sorted(rows, key=lambda r: -r[2])[:TOP_N]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    loaded = sorted({name for name, _, _, _ in rows if name.startswith(HEAVY_MODULES)})
+    if loaded:
+        print(f"⚠️ 첫 화면에 무거운 모듈이 불려 옴: {', '.join(loaded)}")
+        sys.exit(1)
@@ -0,0 +1,90 @@
+# ==========================================
+# [벤치마크] 타임라인 칸 배정 (겹치는 일정이 많은 날)
+# ==========================================
+# 사용법: python benchmarks/bench_layout.py [일정 수 ...]
+# 예전 방식(일정마다 모든 칸을 훑기)과 timeline_layout(힙)을 비교하고,
+# 두 방식의 칸 배정이 같은지, 같은 칸 안에서 겹치는 일정이 없는지도 확인한다.
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timeline_layout import layout_timeline
+
+def make_items(n, seed=7):
+    # 하루 1440분 안에 n개를 몰아넣어 대부분 서로 겹치게 만듦 (시간별 기록/센서 로그 같은 날)
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        s = rng.uniform(0, 1380)
+        dur = max(rng.uniform(1, 240), 30)
+        items.append({'summary': f"#{i}", '_s': s, '_e': s + dur, '_dur': dur})
+    return items
+
+def scan_layout(events):
+    # 예전 calculate_visual_layout 의 칸 배정 (입력은 건드리지 않도록 (항목, 칸, 칸 수)만 돌려줌)
+    sorted_events = sorted(events, key=lambda x: x['_s'])
+    clusters = []
+    current_cluster = [sorted_events[0]]
+    cluster_end = sorted_events[0]['_e']
+    for evt in sorted_events[1:]:
+        if evt['_s'] < cluster_end:
+            current_cluster.append(evt)
+            cluster_end = max(cluster_end, evt['_e'])
+        else:
+            clusters.append(current_cluster)
+            current_cluster = [evt]
+            cluster_end = evt['_e']
+    clusters.append(current_cluster)
+
+    result = []
+    for cluster in clusters:
+        lanes = []
+        for evt in sorted(cluster, key=lambda x: (x['_s'], -x['_dur'])):
+            for lane in lanes:
+                if evt['_s'] >= lane[-1]['_e']:
+                    lane.append(evt)
+                    break
+            else:
+                lanes.append([evt])
+        for i, lane in enumerate(lanes):
+            for evt in lane:
+                result.append((evt, i, len(lanes)))
+    return result
+
+def check_no_overlap(placements):
+    # 시간이 겹치는 두 일정은 차지하는 칸 범위가 겹치면 안 됨
+    active = []
+    for p in sorted(placements, key=lambda p: p.item['_s']):
+        active = [a for a in active if a.item['_e'] > p.item['_s']]
+        for a in active:
+            assert a.lane + a.span <= p.lane or p.lane + p.span <= a.lane, (a, p)
+        active.append(p)
+
+def best_of(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+if __name__ == '__main__':
+    sizes = [int(x) for x in sys.argv[1:]] or [100, 500, 2000, 5000]
+    print(f"{'일정 수':>8} {'칸 수':>6} {'예전(ms)':>10} {'힙(ms)':>10} {'힙+넓히기(ms)':>14}")
+    for n in sizes:
+        items = make_items(n)
+        t_scan, old = best_of(lambda: scan_layout(items))
+        t_heap, new = best_of(lambda: layout_timeline(items))
+        t_expand, expanded = best_of(lambda: layout_timeline(items, expand=True))
+
+        # 칸 배정이 예전과 같아야 함
+        assert [(id(e), lane, lanes) for e, lane, lanes in old] == [(id(p.item), p.lane, p.lanes) for p in new]
+        # 넓혀도 다른 일정과 겹치면 안 됨
+        check_no_overlap(new)
+        check_no_overlap(expanded)
+        max_lanes = max(p.lanes for p in new)
+        print(f"{n:>8} {max_lanes:>6} {t_scan * 1000:>10.1f} {t_heap * 1000:>10.1f} {t_expand * 1000:>14.1f}")
@@ -0,0 +1,74 @@
+# ==========================================
+# [벤치마크] 긴 메모가 있는 날의 렌더링 ("(계속)" 본문: 예전 flex 칼럼 vs 블록)
+# ==========================================
+# 사용법: python benchmarks/bench_paginate.py [날 수] [하루 메모 글자 수] [반복 횟수]
+# 하루 메모가 1만 자 이상인 책을 예전 본문 틀(flex content-wrapper)과 지금 틀(폭만 정한 블록)로
+# 렌더링해서 시간과 쪽 수를 비교한다. 쪽 수가 다르면 블록 폭/여백이 예전 칼럼과 어긋난 것
+
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import diary_render
+from diary_render import Renderer, build_book_html
+from event_model import KST, Event
+
+# 예전 "(계속)" 본문 틀 (본문 칼럼 + 빈 메모 칼럼을 flex 로 나란히)
+_FLEX_TEXT_OPEN = """
+        <div class='date-header-running'>{date_str} (계속)</div>
+        <div class='content-wrapper text-pages-wrapper'>
+            <div class='text-column'>
+        """.format
+_FLEX_TEXT_CLOSE = "</div><div class='memo-column'></div></div>"
+
+_TEXT = "오늘은 가족과 함께 산책을 하고 맛있는 저녁을 먹었다. 아이가 처음으로 자전거를 탔다.\n"
+# 줄바꿈 없이 여러 줄로 넘어가는 긴 문단 (영문/숫자 섞임) -> 글자 폭 어림까지 확인
+_PARAGRAPH = ("주말에 Seoul Forest 에서 2시간 동안 걸었다. 날씨가 좋아서 사진을 42장 찍었고 "
+              "집에 와서 pasta 를 만들어 먹었다. 내일은 도서관에 가서 책 3권을 반납해야 한다. ") * 6 + "\n"
+
+def make_long_days(num_days, desc_chars):
+    daily_data = {}
+    for i in range(num_days):
+        d = date(2026, 1, 1) + timedelta(days=i)
+        day_start = datetime.combine(d, datetime.min.time()).replace(tzinfo=KST)
+        timed = []
+        for j in range(6):
+            # 하루 메모의 대부분은 일기 하나에, 나머지는 짧은 메모
+            chars = desc_chars * 7 // 10 if j == 0 else desc_chars * 3 // 50
+            text = _PARAGRAPH if j == 0 else _TEXT
+            desc = (text * (chars // len(text) + 1))[:chars]
+            s = day_start + timedelta(hours=8 + 2 * j)
+            timed.append(Event('cal', '가족', '#7986cb', f"일정 {j}", desc, False, s, s + timedelta(minutes=90)))
+        daily_data[d] = {'allday': (), 'timed': tuple(timed)}
+    return daily_data
+
+def best_of(fn, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+if __name__ == '__main__':
+    num_days = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    desc_chars = int(sys.argv[2]) if len(sys.argv) > 2 else 12000
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    daily_data = make_long_days(num_days, desc_chars)
+    legend = {'cal': {'name': '가족', 'color': '#7986cb'}}
+    renderer = Renderer()
+    renderer.warm_up()
+
+    block_html = build_book_html(daily_data, legend, ['cal'])
+    diary_render._TEXT_OPEN, diary_render._TEXT_CLOSE = _FLEX_TEXT_OPEN, _FLEX_TEXT_CLOSE
+    flex_html = build_book_html(daily_data, legend, ['cal'])
+
+    results = {}
+    for name, html in (("flex 칼럼", flex_html), ("블록", block_html)):
+        t, document = best_of(lambda: renderer.render(html), repeat)
+        results[name] = t
+        print(f"{name:8s}: {t * 1000:8.1f} ms, {len(document.pages)}쪽 ({num_days}일, 하루 메모 {desc_chars}자)")
+    print(f"렌더링 시간 {100 * (1 - results['블록'] / results['flex 칼럼']):.0f}% 감소")
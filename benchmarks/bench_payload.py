@@ -0,0 +1,39 @@
+# ==========================================
+# [벤치마크] 가져오기 응답 크기 (전체 리소스 vs 가벼운 가져오기)
+# ==========================================
+# 사용법: python benchmarks/bench_payload.py [달 수] [하루 일정 수] [메모 글자 수]
+# 가짜 캘린더 서비스로 같은 기간을 LEAN_FETCH 끄고/켜고 가져와서
+# 응답 JSON 크기(원본, gzip)를 비교한다. 가짜 서비스는 fields 부분 응답을 실제 API처럼 적용함.
+
+import os
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import calendar_fetch
+from calendar_fetch import get_events_from_ids
+from fake_calendar import FakeCalendarService
+
+CALENDARS = ['family', 'sion', 'haon']
+
+def fetch_bytes(lean, months, events_per_day, desc_chars):
+    calendar_fetch.LEAN_FETCH = lean
+    calendar_fetch._colors_cache = calendar_fetch.TTLCache(calendar_fetch.COLORS_TTL_SEC)
+    calendar_fetch._calendar_info_cache = calendar_fetch.TTLCache(calendar_fetch.CALENDAR_INFO_TTL_SEC)
+    service = FakeCalendarService(events_per_day=events_per_day, desc_chars=desc_chars, measure_bytes=True)
+    start = date(2026, 1, 1)
+    daily_data, _, _ = get_events_from_ids(service, CALENDARS, {}, start, start + timedelta(days=30 * months - 1))
+    return service.response_bytes, service.gzip_bytes, sum(len(v['timed']) for v in daily_data.values())
+
+if __name__ == '__main__':
+    months = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    desc_chars = int(sys.argv[3]) if len(sys.argv) > 3 else 80
+    full = fetch_bytes(False, months, per_day, desc_chars)
+    lean = fetch_bytes(True, months, per_day, desc_chars)
+    assert full[2] == lean[2], "가벼운 가져오기로 일정 내용이 달라짐"
+    for name, (raw, gz, _) in (("전체 리소스", full), ("가벼운 가져오기", lean)):
+        print(f"{name:10s}: 원본 {raw / 1024:9.0f}KB / gzip {gz / 1024:7.0f}KB")
+    print(f"원본 {100 * (1 - lean[0] / full[0]):.0f}% / gzip {100 * (1 - lean[1] / full[1]):.0f}% 감소 ({len(CALENDARS)}개 캘린더, {months}개월)")
@@ -0,0 +1,36 @@
+# ==========================================
+# [벤치마크] 짧은 책의 렌더링 준비 비용 (렌더러 재사용 vs 매번 새로)
+# ==========================================
+# 사용법: python benchmarks/bench_renderer.py [반복 횟수]
+# 1일/7일짜리 책을 WeasyPrint 로 레이아웃할 때,
+# 매번 FontConfiguration + CSS 를 새로 만드는 방식과 미리 준비된 Renderer 를 쓰는 방식을 비교한다.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_html import make_daily_data
+from diary_render import Renderer, build_book_html
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+if __name__ == '__main__':
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    legend = {'cal': {'name': '가족', 'color': '#7986cb'}}
+    warm = Renderer()
+    warm.warm_up()
+
+    for num_days in (1, 7):
+        html = build_book_html(make_daily_data(num_days, 8), legend, ['cal'])
+        t_cold = best_of(lambda: Renderer().render(html), repeat)
+        t_warm = best_of(lambda: warm.render(html), repeat)
+        print(f"{num_days}일: 매번 새로 {t_cold * 1000:8.1f} ms / 재사용 {t_warm * 1000:8.1f} ms")
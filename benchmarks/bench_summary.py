@@ -0,0 +1,28 @@
+# ==========================================
+# [벤치마크] 요약 페이지 집계 (book_summary)
+# ==========================================
+# 사용법: python benchmarks/bench_summary.py [년 수] [하루 일정 수]
+# 여러 해짜리 daily_data 로 summarize(NumPy 분 단위 점유) 와 요약 HTML 만들기 시간을 잰다.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_html import make_daily_data
+from book_summary import build_summary_html, summarize
+
+if __name__ == '__main__':
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    daily_data = make_daily_data(365 * years, per_day)
+    legend = {'cal': {'name': '가족', 'color': '#7986cb'}}
+
+    t0 = time.perf_counter()
+    summary = summarize(daily_data, ['cal'])
+    t1 = time.perf_counter()
+    html = build_summary_html(summary, legend)
+    t2 = time.perf_counter()
+    print(f"{years}년 x 하루 {per_day}개: 집계 {(t1 - t0) * 1000:.0f} ms / HTML {(t2 - t1) * 1000:.0f} ms ({len(html) / 1024:.0f}KB)")
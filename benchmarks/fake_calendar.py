@@ -0,0 +1,225 @@
+# ==========================================
+# [벤치마크] 가짜 구글 캘린더 서비스
+# ==========================================
+# get_events_from_ids / EventStore 가 쓰는 service 객체 흉내
+# (colors().get, calendars().get, events().list, new_batch_http_request)
+#
+# 일정은 (seed, 캘린더, 날짜) 로 정해지는 난수로 만들기 때문에 같은 설정이면 항상 같은 결과.
+# 하루 일정 수, 밤샘 일정 비율, 종일 일정 빈도/길이, 메모 길이를 조절할 수 있음.
+# fields 파라미터(부분 응답)를 실제 API처럼 적용하고, measure_bytes=True 면 응답 크기(원본/gzip)를 셈.
+# shared_per_day 개는 모든 캘린더에 같은 iCalUID 로 들어가는 '공유 일정' (가족 캘린더끼리 겹치는 경우)
+
+import gzip
+import json
+import random
+import time
+import zlib
+from datetime import date, datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+_TEXT = "오늘은 가족과 함께 산책을 하고 맛있는 저녁을 먹었다. "
+
+def _split_fields(fields):
+    # 'a,b,items(c,d(e))' → {'a': None, 'b': None, 'items': 'c,d(e)'}
+    out, depth, start = {}, 0, 0
+    for i, ch in enumerate(fields + ','):
+        if ch == '(': depth += 1
+        elif ch == ')': depth -= 1
+        elif ch == ',' and depth == 0:
+            part = fields[start:i].strip()
+            if '(' in part: out[part[:part.index('(')]] = part[part.index('(') + 1:-1]
+            elif part: out[part] = None
+            start = i + 1
+    return out
+
+def project(resource, fields):
+    """구글 API 부분 응답(fields) 흉내. 하위 선택은 dict/list 에 재귀로 적용."""
+    if not fields: return resource
+    if isinstance(resource, list): return [project(x, fields) for x in resource]
+    return {key: project(resource[key], sub) for key, sub in _split_fields(fields).items() if key in resource}
+
+class _Request:
+    def __init__(self, fn, latency, service=None, fields=None):
+        self._fn = fn
+        self._latency = latency
+        self._service = service
+        self._fields = fields
+
+    def execute(self, http=None, num_retries=0):
+        if self._latency: time.sleep(self._latency)
+        return self._result()
+
+    def _result(self):
+        result = project(self._fn(), self._fields)
+        if self._service is not None and self._service.measure_bytes:
+            body = json.dumps(result, ensure_ascii=False).encode()
+            self._service.response_bytes += len(body)
+            self._service.gzip_bytes += len(gzip.compress(body))
+        return result
+
+class _Batch:
+    def __init__(self, callback, latency):
+        self._callback = callback
+        self._latency = latency
+        self._requests = []
+
+    def add(self, request, request_id=None, callback=None):
+        self._requests.append((request, request_id or str(len(self._requests))))
+
+    def execute(self, http=None):
+        # 배치는 HTTP 요청 한 번
+        if self._latency: time.sleep(self._latency)
+        for request, request_id in self._requests:
+            try:
+                self._callback(request_id, request._result(), None)
+            except Exception as e:
+                self._callback(request_id, None, e)
+
+def _parse_time(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+class FakeCalendarService:
+    def __init__(self, events_per_day=8, overnight_ratio=0.1, allday_per_week=1.0, allday_max_days=5,
+                 desc_chars=200, latency_ms=0, seed=0, shared_per_day=0, measure_bytes=False):
+        self.events_per_day = events_per_day
+        self.overnight_ratio = overnight_ratio
+        self.allday_per_week = allday_per_week
+        self.allday_max_days = allday_max_days
+        self.desc_chars = desc_chars
+        self.latency = latency_ms / 1000
+        self.seed = seed
+        self.shared_per_day = shared_per_day
+        self.request_count = 0
+        self.measure_bytes = measure_bytes
+        self.response_bytes = 0
+        self.gzip_bytes = 0
+        self._window_cache = {}
+
+    # --- service 인터페이스 ---
+    def colors(self):
+        return self
+
+    def calendars(self):
+        return _CalendarsResource(self)
+
+    def events(self):
+        return _EventsResource(self)
+
+    def get(self, fields=None):
+        # colors().get()
+        return self._request(lambda: {'kind': 'calendar#colors', 'updated': '2012-02-14T00:00:00.000Z',
+                                      'calendar': {'1': {'background': '#a4bdfc', 'foreground': '#1d1d1d'}},
+                                      'event': {'1': {'background': '#7986cb', 'foreground': '#1d1d1d'}}}, fields)
+
+    def new_batch_http_request(self, callback=None):
+        self.request_count += 1
+        return _Batch(callback, self.latency)
+
+    def _request(self, fn, fields=None):
+        self.request_count += 1
+        return _Request(fn, self.latency, self, fields)
+
+    # --- 일정 만들기 ---
+    def _description(self, rng):
+        n = int(rng.uniform(0.2, 1.8) * self.desc_chars)
+        return (_TEXT * (n // len(_TEXT) + 1))[:n]
+
+    def events_for_day(self, cal_id, day):
+        rng = random.Random(f"{self.seed}:{cal_id}:{day.isoformat()}")
+        day_start = datetime.combine(day, datetime.min.time()).replace(tzinfo=KST)
+        items = []
+        for j in range(self.events_per_day):
+            if rng.random() < self.overnight_ratio:
+                # 밤샘 일정 (예: 23시 ~ 다음날 7시 수면)
+                start = day_start + timedelta(hours=rng.uniform(21, 24))
+                end = start + timedelta(hours=rng.uniform(6, 10))
+            else:
+                start = day_start + timedelta(minutes=rng.randint(0, 1380))
+                end = start + timedelta(minutes=rng.choice([15, 30, 45, 60, 90, 120, 180]))
+            items.append({
+                'id': f"{cal_id}-{day.isoformat()}-{j}", 'iCalUID': f"{cal_id}-{day.isoformat()}-{j}@fake",
+                'status': 'confirmed', 'summary': f"일정 {j}", 'description': self._description(rng),
+                'start': {'dateTime': start.isoformat()}, 'end': {'dateTime': end.isoformat()},
+            })
+        shared_rng = random.Random(f"{self.seed}:shared:{day.isoformat()}")
+        for j in range(self.shared_per_day):
+            start = day_start + timedelta(minutes=shared_rng.randint(0, 1380))
+            end = start + timedelta(minutes=shared_rng.choice([30, 60, 120]))
+            items.append({
+                'id': f"{cal_id}-{day.isoformat()}-shared{j}", 'iCalUID': f"shared-{day.isoformat()}-{j}@fake",
+                'status': 'confirmed', 'summary': f"가족 일정 {j}", 'description': self._description(shared_rng),
+                'start': {'dateTime': start.isoformat()}, 'end': {'dateTime': end.isoformat()},
+            })
+        if rng.random() < self.allday_per_week / 7:
+            span = rng.randint(1, self.allday_max_days)
+            items.append({
+                'id': f"{cal_id}-{day.isoformat()}-allday", 'iCalUID': f"{cal_id}-{day.isoformat()}-allday@fake",
+                'status': 'confirmed',
+                'summary': "여행", 'description': self._description(rng),
+                'start': {'date': day.isoformat()}, 'end': {'date': (day + timedelta(days=span)).isoformat()},
+            })
+        return items
+
+    def window_events(self, cal_id, time_min, time_max):
+        lo, hi = _parse_time(time_min), _parse_time(time_max)
+        first = lo.date() - timedelta(days=self.allday_max_days + 1)
+        items = []
+        day = first
+        while day <= hi.date():
+            for event in self.events_for_day(cal_id, day):
+                if 'date' in event['start']:
+                    s = datetime.combine(date.fromisoformat(event['start']['date']), datetime.min.time()).replace(tzinfo=KST)
+                    e = datetime.combine(date.fromisoformat(event['end']['date']), datetime.min.time()).replace(tzinfo=KST)
+                else:
+                    s, e = _parse_time(event['start']['dateTime']), _parse_time(event['end']['dateTime'])
+                if s < hi and e > lo: items.append((s, event))
+            day += timedelta(days=1)
+        items.sort(key=lambda x: x[0])
+        return [event for _, event in items]
+
+def _full_resource(cal_id, event):
+    # 책에는 안 쓰지만 실제 API 가 기본으로 주는 필드들 (난수를 쓰지 않으므로 일정 내용은 그대로)
+    event_id = event['id']
+    return {
+        'kind': 'calendar#event', 'etag': f'"{zlib.crc32(event_id.encode())}"', **event,
+        'htmlLink': f"https://www.google.com/calendar/event?eid={event_id}",
+        'created': '2026-01-01T00:00:00.000Z', 'updated': '2026-01-02T00:00:00.000Z',
+        'creator': {'email': cal_id, 'self': True}, 'organizer': {'email': cal_id, 'displayName': f"가짜 {cal_id}", 'self': True},
+        'attendees': [{'email': f"family{k}@example.com", 'responseStatus': 'accepted'} for k in range(3)],
+        'sequence': 0, 'eventType': 'default', 'reminders': {'useDefault': True},
+    }
+
+class _CalendarsResource:
+    def __init__(self, service):
+        self.service = service
+
+    def get(self, calendarId, fields=None):
+        return self.service._request(lambda: {
+            'kind': 'calendar#calendar', 'etag': f'"{zlib.crc32(calendarId.encode())}"', 'id': calendarId,
+            'summary': f"가짜 {calendarId}", 'timeZone': 'Asia/Seoul', 'colorId': '1',
+            'conferenceProperties': {'allowedConferenceSolutionTypes': ['hangoutsMeet']},
+        }, fields)
+
+class _EventsResource:
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, calendarId, timeMin=None, timeMax=None, maxResults=250, pageToken=None, syncToken=None, fields=None, **kwargs):
+        def run():
+            if syncToken:
+                # 증분 동기화: 가짜 서버에서는 바뀐 일정이 없음
+                return {'items': [], 'nextSyncToken': syncToken}
+            key = (calendarId, timeMin, timeMax)
+            items = self.service._window_cache.get(key)
+            if items is None:
+                items = self.service._window_cache[key] = self.service.window_events(calendarId, timeMin, timeMax)
+            offset = int(pageToken or 0)
+            page = [_full_resource(calendarId, event) for event in items[offset:offset + maxResults]]  # 실제 API처럼 매번 새 dict
+            result = {'kind': 'calendar#events', 'etag': '"p33c"', 'summary': calendarId, 'timeZone': 'Asia/Seoul',
+                      'accessRole': 'reader', 'defaultReminders': [], 'items': page}
+            if offset + maxResults < len(items):
+                result['nextPageToken'] = str(offset + maxResults)
+            else:
+                result['nextSyncToken'] = f"sync-{calendarId}"
+            return result
+        return self.service._request(run, fields)
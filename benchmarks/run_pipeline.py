@@ -0,0 +1,198 @@
+# ==========================================
+# [벤치마크] 전체 파이프라인 (가져오기 → 그룹핑 → 레이아웃 → HTML → PDF)
+# ==========================================
+# 구글 인증 없이 가짜 캘린더 서비스(fake_calendar.py)로 단계별 시간과 최대 메모리를 잰다.
+#
+#   python benchmarks/run_pipeline.py                         # 1/30/100/365일, 결과를 benchmarks/results/ 에 저장
+#   python benchmarks/run_pipeline.py --days 30 365 --no-pdf
+#   python benchmarks/run_pipeline.py --baseline benchmarks/results/이전.json   # 비교 + 회귀 검사
+#
+# --baseline 을 주면 단계별로 이전 결과와 비교하고, --max-regression 배 이상 느려진 단계가
+# 있으면 종료 코드 1 로 끝난다 (성능 변경마다 돌리는 회귀 검사용).
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import calendar_fetch
+from calendar_fetch import DayIndex, get_events_from_ids, iter_event_pages
+from diary_render import build_book_html, build_visual_events, render_pdf
+from event_model import event_from_api
+from fake_calendar import FakeCalendarService
+from timeline_layout import layout_timeline
+
+DEFAULT_DAYS = [1, 30, 100, 365]
+STAGES = ['fetch', 'group', 'layout', 'html', 'pdf']
+MIN_COMPARE_SEC = 0.005  # 이보다 짧은 단계는 잡음이 커서 회귀 검사에서 뺌
+
+def _peak_rss_mb():
+    # 리눅스는 KB, 맥은 byte 단위
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+TRACE_MEMORY = True
+
+def measure(fn, setup=None):
+    """fn() 을 실행하고 (결과, 걸린 초, 파이썬 힙 최대 MB) 를 돌려준다.
+
+    tracemalloc 을 켜면 몇 배 느려지므로 시간은 추적 없이 재고, 메모리는 한 번 더 돌려서 잰다.
+    """
+    if setup: setup()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    if not TRACE_MEMORY: return result, elapsed, None
+
+    if setup: setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+def _reset_caches():
+    # 매 측정을 '처음 실행' 기준으로 맞춤
+    calendar_fetch._colors_cache.clear()
+    calendar_fetch._calendar_info_cache.clear()
+
+def run_case(service, cal_ids, num_days, with_pdf):
+    start_d = date(2026, 1, 1)
+    end_d = start_d + timedelta(days=num_days - 1)
+    legend = {}
+    stages = {}
+
+    # 가짜 서비스의 일정 생성 비용이 측정에 섞이지 않도록 한 번 미리 돌려둠
+    get_events_from_ids(service, cal_ids, {}, start_d, end_d)
+
+    (daily_data, legend, _), t, mem = measure(lambda: get_events_from_ids(service, cal_ids, {}, start_d, end_d),
+                                              setup=_reset_caches)
+    stages['fetch'] = {'sec': t, 'peak_mb': mem}
+
+    # 그룹핑만 따로: 내려받은 원본 일정으로 DayIndex 를 다시 만든다
+    time_min = (datetime.combine(start_d, datetime.min.time()) - timedelta(days=1)).isoformat() + 'Z'
+    time_max = (datetime.combine(end_d, datetime.max.time()) + timedelta(days=1)).isoformat() + 'Z'
+    raw_events = [event_from_api(item, cal_id, cal_id, '#7986cb')
+                  for cal_id in cal_ids for page in iter_event_pages(service, cal_id, time_min, time_max) for item in page]
+
+    def group():
+        day_index = DayIndex(start_d, end_d)
+        for event in raw_events: day_index.add(event)
+        return day_index.build()
+    _, t, mem = measure(group)
+    stages['group'] = {'sec': t, 'peak_mb': mem, 'events': len(raw_events)}
+
+    def layout():
+        return sum(len(layout_timeline(build_visual_events(d, v['timed']))) for d, v in daily_data.items())
+    placed, t, mem = measure(layout)
+    stages['layout'] = {'sec': t, 'peak_mb': mem, 'placements': placed}
+
+    html, t, mem = measure(lambda: build_book_html(daily_data, legend, cal_ids))
+    stages['html'] = {'sec': t, 'peak_mb': mem, 'html_mb': len(html.encode()) / (1024 * 1024)}
+
+    if with_pdf:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "bench.pdf")
+            _, t, mem = measure(lambda: render_pdf(html, target=path))
+            stages['pdf'] = {'sec': t, 'peak_mb': mem, 'pdf_mb': os.path.getsize(path) / (1024 * 1024)}
+
+    return {
+        'days': num_days,
+        'events': sum(len(v['allday']) + len(v['timed']) for v in daily_data.values()),
+        'stages': stages,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+def _git_rev():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+def compare(results, baseline, max_regression):
+    """이전 결과와 단계별 시간 비율을 출력하고, 회귀한 (일수, 단계) 목록을 돌려준다."""
+    base_cases = {case['days']: case for case in baseline['cases']}
+    regressions = []
+    print("\n[이전 결과와 비교] (현재 / 이전)")
+    for case in results['cases']:
+        base = base_cases.get(case['days'])
+        if not base: continue
+        for stage in STAGES:
+            now, before = case['stages'].get(stage), base['stages'].get(stage)
+            if not now or not before: continue
+            ratio = now['sec'] / before['sec'] if before['sec'] else float('inf')
+            flag = ""
+            if ratio > max_regression and before['sec'] >= MIN_COMPARE_SEC:
+                flag = "  ❌ 회귀"
+                regressions.append((case['days'], stage))
+            print(f"  {case['days']:>4}일 {stage:<7} {before['sec'] * 1000:9.1f} → {now['sec'] * 1000:9.1f} ms  x{ratio:.2f}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="일기장 파이프라인 오프라인 벤치마크")
+    parser.add_argument('--days', type=int, nargs='+', default=DEFAULT_DAYS)
+    parser.add_argument('--calendars', type=int, default=10)
+    parser.add_argument('--events-per-day', type=int, default=8)
+    parser.add_argument('--overnight-ratio', type=float, default=0.1)
+    parser.add_argument('--allday-per-week', type=float, default=1.0)
+    parser.add_argument('--allday-max-days', type=int, default=5)
+    parser.add_argument('--desc-chars', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=0, help="가짜 API 요청 하나당 지연")
+    parser.add_argument('--no-pdf', action='store_true', help="WeasyPrint 단계 건너뛰기")
+    parser.add_argument('--no-memory', action='store_true', help="tracemalloc 메모리 측정 건너뛰기 (절반 시간)")
+    parser.add_argument('--out', help="결과 JSON 경로 (기본: benchmarks/results/<시각>.json)")
+    parser.add_argument('--baseline', help="비교할 이전 결과 JSON")
+    parser.add_argument('--max-regression', type=float, default=1.25)
+    args = parser.parse_args()
+
+    global TRACE_MEMORY
+    TRACE_MEMORY = not args.no_memory
+
+    service = FakeCalendarService(
+        events_per_day=args.events_per_day, overnight_ratio=args.overnight_ratio,
+        allday_per_week=args.allday_per_week, allday_max_days=args.allday_max_days,
+        desc_chars=args.desc_chars, latency_ms=args.latency_ms,
+    )
+    cal_ids = [f"cal{i}@fake" for i in range(args.calendars)]
+
+    results = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'git_rev': _git_rev(),
+        'python': platform.python_version(),
+        'config': {k: v for k, v in vars(args).items() if k not in ('out', 'baseline', 'max_regression')},
+        'cases': [],
+    }
+    print(f"{'일수':>5} {'일정':>7} " + " ".join(f"{s + '(ms)':>11}" for s in STAGES) + f" {'RSS(MB)':>8}")
+    for num_days in args.days:
+        case = run_case(service, cal_ids, num_days, not args.no_pdf)
+        results['cases'].append(case)
+        cols = " ".join(
+            f"{case['stages'][s]['sec'] * 1000:>11.1f}" if s in case['stages'] else f"{'-':>11}" for s in STAGES
+        )
+        print(f"{num_days:>5} {case['events']:>7} {cols} {case['peak_rss_mb']:>8.0f}")
+
+    out_path = args.out or os.path.join(ROOT, 'benchmarks', 'results', f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {out_path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.max_regression):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
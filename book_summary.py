@@ -0,0 +1,179 @@
+# ==========================================
+# [시온이네 일기장] 책 앞 요약 페이지 (연간 한눈에 보기)
+# ==========================================
+# 1. 캘린더별 하루 시간 히트맵, 월별 합계, 수면/활동 추이를 책 맨 앞에 넣음
+# 2. 집계는 NumPy 로: 시간 일정을 (시작 분, 끝 분) 배열로 만든 뒤
+#    분 단위 점유(occupancy)를 bincount + cumsum 으로 한 번에 계산
+#    -> 일정/분마다 도는 파이썬 루프 없음. 여러 해짜리 범위도 1초 안쪽
+# 3. 같은 캘린더에서 겹친 일정은 한 번만 셈 (합집합)
+#
+# get_events_from_ids 가 만든 daily_data(날짜 → Event 튜플)를 그대로 받음
+
+from datetime import datetime
+
+import numpy as np
+
+from event_model import KST
+
+MINUTES_PER_DAY = 1440
+SLEEP_KEYWORDS = ('수면', '잠', 'sleep')  # 제목에 들어 있으면 수면 일정으로 봄
+TREND_WINDOW_DAYS = 7
+CHART_WIDTH = 680     # A4 본문 폭(px)
+CHART_HEIGHT = 160
+
+# --- [1. 집계] ---
+def _is_sleep(summary):
+    summary = summary.lower()
+    return any(keyword in summary for keyword in SLEEP_KEYWORDS)
+
+def _occupancy(starts, ends, total_minutes):
+    # 시작 분에 +1, 끝 분에 -1 → 누적합이 0보다 크면 그 분은 '일정 있음'
+    diff = np.bincount(starts, minlength=total_minutes + 1) - np.bincount(ends, minlength=total_minutes + 1)
+    return np.cumsum(diff[:total_minutes]) > 0
+
+def _rolling_mean(values, window=TREND_WINDOW_DAYS):
+    # 앞쪽 window 일 평균 (처음 며칠은 있는 날만으로 평균)
+    sums = np.cumsum(np.concatenate(([0.0], values)))
+    idx = np.arange(1, len(values) + 1)
+    lo = np.maximum(0, idx - window)
+    return (sums[idx] - sums[lo]) / (idx - lo)
+
+def summarize(daily_data, ordered_ids):
+    """daily_data 의 시간 일정을 집계한다.
+
+    돌려주는 dict:
+      days (datetime64[D] 배열), calendars (ID 목록), hours (캘린더 x 날짜, 시간),
+      events (캘린더별 일정 수), months (datetime64[M] 배열), monthly_hours (캘린더 x 월),
+      active_hours (날짜별, 캘린더 합집합), sleep_hours (날짜별, 전날 정오 ~ 그날 정오)
+    """
+    start_date, end_date = min(daily_data), max(daily_data)
+    num_days = (end_date - start_date).days + 1
+    total = num_days * MINUTES_PER_DAY
+    origin = datetime.combine(start_date, datetime.min.time()).replace(tzinfo=KST).timestamp()
+
+    # 여러 날에 걸친 일정은 날짜마다 같은 Event 가 들어 있으므로 한 번만 모음
+    events = list({id(evt): evt for v in daily_data.values() for evt in v['timed']}.values())
+    calendars = [cal_id for cal_id in ordered_ids if any(evt.calendar_id == cal_id for evt in events)]
+    cal_index = {cal_id: i for i, cal_id in enumerate(calendars)}
+    events = [evt for evt in events if evt.calendar_id in cal_index]
+
+    cal = np.fromiter((cal_index[evt.calendar_id] for evt in events), dtype=np.int64, count=len(events))
+    starts = np.fromiter((evt.start.timestamp() for evt in events), dtype=np.float64, count=len(events))
+    ends = np.fromiter((evt.end.timestamp() for evt in events), dtype=np.float64, count=len(events))
+    sleep = np.fromiter((_is_sleep(evt.summary) for evt in events), dtype=bool, count=len(events))
+    starts = np.clip((starts - origin) // 60, 0, total).astype(np.int64)
+    ends = np.clip((ends - origin) // 60, 0, total).astype(np.int64)
+    valid = ends > starts
+    cal, starts, ends, sleep = cal[valid], starts[valid], ends[valid], sleep[valid]
+
+    hours = np.zeros((len(calendars), num_days))
+    for i in range(len(calendars)):
+        mask = cal == i
+        occ = _occupancy(starts[mask], ends[mask], total)
+        hours[i] = occ.reshape(num_days, MINUTES_PER_DAY).sum(axis=1) / 60
+
+    active = _occupancy(starts, ends, total).reshape(num_days, MINUTES_PER_DAY).sum(axis=1) / 60
+    # 밤잠은 자정을 넘기므로 '전날 12시 ~ 그날 12시' 창으로 세서 그날(일어난 날)에 붙임
+    sleep_occ = np.concatenate((np.zeros(MINUTES_PER_DAY // 2, dtype=bool),
+                                _occupancy(starts[sleep], ends[sleep], total)))[:total]
+    sleep_hours = sleep_occ.reshape(num_days, MINUTES_PER_DAY).sum(axis=1) / 60
+
+    days = np.arange(np.datetime64(start_date), np.datetime64(end_date) + 1)
+    months, month_first = np.unique(days.astype('datetime64[M]'), return_index=True)
+    monthly_hours = np.add.reduceat(hours, month_first, axis=1) if len(calendars) else np.zeros((0, len(months)))
+
+    return {
+        'days': days,
+        'calendars': calendars,
+        'hours': hours,
+        'events': np.bincount(cal, minlength=len(calendars)),
+        'months': months,
+        'monthly_hours': monthly_hours,
+        'active_hours': active,
+        'sleep_hours': sleep_hours,
+        'has_sleep': bool(sleep.any()),
+    }
+
+# --- [2. 요약 페이지 HTML] ---
+_PAGE_OPEN = "<div class='summary-page' style='page-break-after: always;'><div class='date-header' style='margin-bottom: 10px;'>{title}</div>".format
+_SECTION_TITLE = "<div class='text-title' style='margin: 14px 0 6px 0; color:#5d4037;'>{title}</div>".format
+_CELL = "padding: 2px 6px; border-bottom: 1px solid #eee; text-align: right;"
+
+def _table(header, rows):
+    out = ["<table style='border-collapse: collapse; font-size: 7.5pt; width: 100%;'><tr>"]
+    out.extend(f"<th style='{_CELL} color:#666;'>{h}</th>" for h in header)
+    out.append("</tr>")
+    for row in rows:
+        out.append("<tr>" + "".join(f"<td style='{_CELL}'>{cell}</td>" for cell in row) + "</tr>")
+    out.append("</table>")
+    return "".join(out)
+
+def _heatmap_svg(days, hours, color):
+    # 깃허브 잔디처럼: 열 = 주, 행 = 요일(월~일), 진하기 = 그날 시간
+    weekday = (days.astype('datetime64[D]').view('int64') - 4) % 7        # 1970-01-01 은 목요일 → 월=0
+    week = (np.arange(len(days)) + weekday[0]) // 7
+    cell = min(12.0, (CHART_WIDTH - 20) / (week[-1] + 1))
+    peak = hours.max() or 1
+    opacity = np.round(0.08 + 0.92 * hours / peak, 2)
+    rects = "".join(
+        f"<rect x='{20 + w * cell:.1f}' y='{d * cell:.1f}' width='{cell * 0.9:.1f}' height='{cell * 0.9:.1f}' "
+        f"fill='{color}' fill-opacity='{o if h > 0 else 0.05}'/>"
+        for w, d, o, h in zip(week.tolist(), weekday.tolist(), opacity.tolist(), hours.tolist())
+    )
+    labels = "".join(f"<text x='0' y='{(d + 0.8) * cell:.1f}' font-size='6pt' fill='#888'>{name}</text>"
+                     for d, name in ((0, '월'), (3, '목'), (6, '일')))
+    return f"<svg width='{CHART_WIDTH}' height='{7 * cell + 4:.0f}'>{labels}{rects}</svg>"
+
+def _trend_svg(values, color, max_value=None):
+    # 날짜별 값은 옅은 점, TREND_WINDOW_DAYS 일 평균은 선
+    n = len(values)
+    top = max_value or max(float(values.max()), 1.0)
+    xs = np.linspace(0, CHART_WIDTH, n) if n > 1 else np.array([CHART_WIDTH / 2])
+    ys = CHART_HEIGHT - values / top * (CHART_HEIGHT - 10)
+    mean_ys = CHART_HEIGHT - _rolling_mean(values) / top * (CHART_HEIGHT - 10)
+    dots = "".join(f"<circle cx='{x:.1f}' cy='{y:.1f}' r='1.2' fill='{color}' fill-opacity='0.35'/>"
+                   for x, y in zip(xs.tolist(), ys.tolist()))
+    line = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(xs.tolist(), mean_ys.tolist()))
+    grid = "".join(f"<line x1='0' x2='{CHART_WIDTH}' y1='{CHART_HEIGHT - h / top * (CHART_HEIGHT - 10):.1f}' "
+                   f"y2='{CHART_HEIGHT - h / top * (CHART_HEIGHT - 10):.1f}' stroke='#eee'/>"
+                   f"<text x='0' y='{CHART_HEIGHT - h / top * (CHART_HEIGHT - 10) - 2:.1f}' font-size='6pt' fill='#999'>{h:g}h</text>"
+                   for h in np.linspace(0, top, 4)[1:].round(1).tolist())
+    return (f"<svg width='{CHART_WIDTH}' height='{CHART_HEIGHT + 4}'>{grid}{dots}"
+            f"<polyline points='{line}' fill='none' stroke='{color}' stroke-width='1.5'/></svg>")
+
+def build_summary_html(summary, cal_legend_info):
+    """요약 페이지들의 HTML 조각 (build_book_html 결과처럼 <html><body> 로 감싸서 렌더링)."""
+    days, calendars = summary['days'], summary['calendars']
+    period = f"{days[0]} ~ {days[-1]} ({len(days)}일)"
+    names = [cal_legend_info[cal_id]['name'] for cal_id in calendars]
+    colors = [cal_legend_info[cal_id]['color'] for cal_id in calendars]
+    out = [_PAGE_OPEN(title="한눈에 보기"), f"<div class='text-meta'>{period}</div>"]
+
+    out.append(_SECTION_TITLE(title="캘린더별 합계"))
+    out.append(_table(
+        ["캘린더", "일정 수", "총 시간", "하루 평균", "가장 긴 날"],
+        [[name, int(count), f"{h.sum():.0f}h", f"{h.mean():.1f}h", f"{days[int(h.argmax())]} ({h.max():.1f}h)"]
+         for name, count, h in zip(names, summary['events'].tolist(), summary['hours'])],
+    ))
+    out.append(_SECTION_TITLE(title="월별 합계 (시간)"))
+    out.append(_table(
+        ["월"] + names + ["합계"],
+        [[str(month)] + [f"{v:.0f}" for v in column] + [f"{column.sum():.0f}"]
+         for month, column in zip(summary['months'].tolist(), summary['monthly_hours'].T)],
+    ))
+    out.append("</div>")
+
+    out.append(_PAGE_OPEN(title="하루 시간 히트맵"))
+    for name, color, h in zip(names, colors, summary['hours']):
+        out.append(_SECTION_TITLE(title=f"{name} · 최대 {h.max():.1f}h"))
+        out.append(_heatmap_svg(days, h, color))
+    out.append("</div>")
+
+    out.append(_PAGE_OPEN(title="추이"))
+    out.append(_SECTION_TITLE(title=f"활동 시간 (하루, {TREND_WINDOW_DAYS}일 평균 선)"))
+    out.append(_trend_svg(summary['active_hours'], '#5d4037', max_value=24))
+    if summary['has_sleep']:
+        out.append(_SECTION_TITLE(title=f"수면 시간 (제목에 {'/'.join(SLEEP_KEYWORDS)} 이 들어간 일정)"))
+        out.append(_trend_svg(summary['sleep_hours'], '#3f51b5', max_value=12))
+    out.append("</div>")
+    return "".join(out)
@@ -0,0 +1,500 @@
+# ==========================================
+# [시온이네 일기장] 캘린더 가져오기 엔진
+# ==========================================
+# 1. 여러 캘린더를 스레드 풀로 동시에 가져옴 (MAX_FETCH_WORKERS 로 동시성 제한)
+# 2. nextPageToken 을 끝까지 따라가서 바쁜 캘린더도 잘리지 않게 함
+# 3. 페이지가 도착하는 대로 날짜별 그룹핑 단계(DayIndex)로 바로 흘려보냄
+# 4. store(EventStore)를 넘기면 syncToken 으로 동기화한 뒤 로컬 저장소에서 읽음
+# 5. 색상표/캘린더 정보는 프로세스 전체 TTL 캐시에 보관 (세션끼리 공유)
+#    -> 캘린더 정보는 배치 요청 한 번으로, 429 등은 지수 백오프로 재시도
+# 6. 가벼운 가져오기(LEAN_FETCH): fields 파라미터로 책에 쓰는 필드만 받음 (참석자/회의 링크/알림/etag 등 제외)
+#    응답 gzip 은 googleapiclient 가 이미 요청함 (Accept-Encoding: gzip + User-Agent 의 "(gzip)")
+# 7. 여러 캘린더에 공유된 같은 일정(iCalUID + 시작 시각)은 그룹핑 단계에서 하나로 합침
+#    -> 타임라인 칸/본문/페이지가 사본 수만큼 늘지 않음. 색은 priority(기본: 입력 순서)가 앞선 캘린더 것
+
+import functools
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from event_model import KST, duplicate_key, event_from_api, merge_copies
+
+# 구글 캘린더 표준 이벤트 색상표 (Fallback용)
+FALLBACK_EVENT_COLORS = {
+    '1': '#7986cb', '2': '#33b679', '3': '#8e24aa', '4': '#e67c73',
+    '5': '#f6c026', '6': '#f5511d', '7': '#039be5', '8': '#616161',
+    '9': '#3f51b5', '10': '#0b8043', '11': '#d60000'
+}
+
+MAX_FETCH_WORKERS = 8   # 동시에 가져올 캘린더 수
+PAGE_SIZE = 2500        # events().list 한 페이지 최대 크기 (API 상한)
+BATCH_LIMIT = 50        # 배치 요청 하나에 담을 수 있는 최대 요청 수
+
+COLORS_TTL_SEC = 24 * 3600
+CALENDAR_INFO_TTL_SEC = 10 * 60
+
+# 책에 쓰는 필드 + 인스턴스 식별자 + 동기화/삭제 처리(status)에 필요한 필드
+LEAN_FETCH = os.environ.get('DIARY_LEAN_FETCH', '1') != '0'  # 0 이면 전체 리소스를 받음 (예전 방식)
+EVENT_FIELDS = 'id,iCalUID,status,summary,description,colorId,start,end,recurringEventId,originalStartTime'
+EVENT_LIST_FIELDS = f'nextPageToken,nextSyncToken,items({EVENT_FIELDS})'
+CALENDAR_INFO_FIELDS = 'summary,colorId'
+COLORS_FIELDS = 'calendar,event'
+
+DEDUPE_EVENTS = os.environ.get('DIARY_DEDUPE', '1') != '0'  # 0 이면 캘린더마다 따로 표시 (예전 방식)
+
+MAX_RETRIES = 5
+BACKOFF_BASE_SEC = 0.5
+BACKOFF_MAX_SEC = 16
+
+# --- [TTL 캐시] ---
+class TTLCache:
+    """스레드 안전한 간단한 TTL 캐시. 모듈 전역으로 두면 모든 세션이 같이 씀."""
+
+    def __init__(self, ttl, maxsize=512):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None: return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._data) >= self.maxsize:
+                now = time.monotonic()
+                for k in [k for k, (exp, _) in self._data.items() if exp < now]:
+                    del self._data[k]
+                # 그래도 꽉 차 있으면 가장 먼저 만료될 항목부터 버림
+                while len(self._data) >= self.maxsize:
+                    del self._data[min(self._data, key=lambda k: self._data[k][0])]
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+_colors_cache = TTLCache(COLORS_TTL_SEC)
+_calendar_info_cache = TTLCache(CALENDAR_INFO_TTL_SEC)
+
+# --- [재시도 / 백오프] ---
+def error_status(error):
+    return getattr(getattr(error, 'resp', None), 'status', None)
+
+def is_rate_limited(error):
+    status = error_status(error)
+    if status == 429: return True
+    # 구글 API는 한도 초과를 403 + rateLimitExceeded 로 돌려주기도 함
+    return status == 403 and 'ratelimitexceeded' in str(error).lower()
+
+def _is_retryable(error):
+    return is_rate_limited(error) or error_status(error) in (500, 502, 503, 504)
+
+def _backoff_sleep(attempt):
+    delay = min(BACKOFF_MAX_SEC, BACKOFF_BASE_SEC * (2 ** attempt))
+    time.sleep(delay * (0.5 + random.random() / 2))  # 지터
+
+def execute_with_backoff(request, http=None):
+    """request.execute() 를 실행하되, 한도 초과/일시 오류면 지수 백오프로 재시도."""
+    attempt = 0
+    while True:
+        try:
+            return request.execute(http=http)
+        except Exception as e:
+            if attempt >= MAX_RETRIES or not _is_retryable(e): raise
+            _backoff_sleep(attempt)
+            attempt += 1
+
+# httplib2 는 스레드 안전하지 않으므로, 스레드(워커/세션)마다 별도의 Http 를 씀
+_thread_local = threading.local()
+
+def _thread_http(service):
+    http = getattr(_thread_local, 'http', None)
+    if http is not None: return http
+    creds = getattr(getattr(service, '_http', None), 'credentials', None)
+    if creds is None: return None  # 인증 정보가 없는 서비스(테스트용 등)는 기본 http 사용
+    import google_auth_httplib2
+    import httplib2
+    http = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http())
+    _thread_local.http = http
+    return http
+
+# --- [서비스 / 입력 해석] ---
+CALENDAR_SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
+
+def build_calendar_service(service_account_info):
+    """서비스 계정 정보(dict)로 캘린더 API 서비스를 만든다. (서비스, 로봇 이메일) 을 돌려줌."""
+    from google.oauth2 import service_account
+    from googleapiclient.discovery import build
+    creds = service_account.Credentials.from_service_account_info(service_account_info, scopes=CALENDAR_SCOPES)
+    robot_email = service_account_info.get("client_email", "알 수 없음")
+    return build('calendar', 'v3', credentials=creds), robot_email
+
+def normalize_color(color_input):
+    color_input = color_input.strip().lower()
+    colors = {
+        'red': '#FF0000', 'green': '#008000', 'blue': '#0000FF',
+        'yellow': '#FFFF00', 'orange': '#FFA500', 'purple': '#800080',
+        'pink': '#FFC0CB', 'black': '#000000', 'white': '#FFFFFF',
+        'brown': '#A52A2A', 'gray': '#808080', 'grey': '#808080',
+        'cyan': '#00FFFF', 'magenta': '#FF00FF', 'lime': '#00FF00',
+        'olive': '#808000', 'maroon': '#800000', 'navy': '#000080',
+        'teal': '#008080', 'silver': '#C0C0C0', 'gold': '#FFD700'
+    }
+    if color_input in colors: return colors[color_input]
+    if all(c in '0123456789abcdef' for c in color_input) and len(color_input) in [3, 6]:
+        return f"#{color_input}"
+    return color_input
+
+def parse_calendar_ids(items):
+    """'ID' 또는 'ID | 색상' 목록(또는 콤마로 구분된 문자열)을 (ID 목록, {ID: 색상}) 으로 바꾼다."""
+    if isinstance(items, str): items = items.split(',')
+    final_ids = []
+    custom_colors = {}
+    for item in (x.strip() for x in items):
+        if not item: continue
+        if "|" in item:
+            cid, color_input = (part.strip() for part in item.split("|", 1))
+            final_ids.append(cid)
+            custom_colors[cid] = normalize_color(color_input)
+        else:
+            final_ids.append(item)
+    return final_ids, custom_colors
+
+# --- [색상표 / 캘린더 정보] ---
+def lean_fields(fields):
+    """API 호출에 붙일 fields 인자. LEAN_FETCH 가 꺼져 있으면 빈 dict (전체 리소스)."""
+    return {'fields': fields} if LEAN_FETCH else {}
+
+def get_google_colors(service):
+    cached = _colors_cache.get('colors')
+    if cached is not None: return cached
+    try:
+        colors = execute_with_backoff(service.colors().get(**lean_fields(COLORS_FIELDS)), http=_thread_http(service))
+        result = (colors.get('calendar', {}), colors.get('event', {}))
+        _colors_cache.set('colors', result)
+        return result
+    except:
+        return {}, {}
+
+def get_calendar_infos(service, cal_ids):
+    """calendars().get 을 배치 요청으로 한꺼번에 보냄. {cal_id: 정보 dict 또는 Exception}"""
+    results = {}
+    pending = []
+    for cal_id in cal_ids:
+        cached = _calendar_info_cache.get(cal_id)
+        if cached is not None: results[cal_id] = cached
+        else: pending.append(cal_id)
+
+    http = _thread_http(service)
+    attempt = 0
+    while pending:
+        retry = []
+
+        def on_response(request_id, response, exception):
+            cal_id = pending[int(request_id)]
+            if exception is None:
+                _calendar_info_cache.set(cal_id, response)
+                results[cal_id] = response
+            elif _is_retryable(exception):
+                retry.append(cal_id)
+                results[cal_id] = exception
+            else:
+                results[cal_id] = exception
+
+        for i in range(0, len(pending), BATCH_LIMIT):
+            chunk = pending[i:i + BATCH_LIMIT]
+            batch = service.new_batch_http_request(callback=on_response)
+            for idx, cal_id in enumerate(chunk):
+                batch.add(service.calendars().get(calendarId=cal_id, **lean_fields(CALENDAR_INFO_FIELDS)),
+                          request_id=str(i + idx))
+            try:
+                execute_with_backoff(batch, http=http)
+            except Exception as e:
+                for cal_id in chunk: results[cal_id] = e
+
+        # 배치 안에서 한도 초과난 요청만 골라서 다시 보냄
+        if not retry or attempt >= MAX_RETRIES: break
+        _backoff_sleep(attempt)
+        attempt += 1
+        pending = retry
+    return results
+
+def resolve_event_color(event, default_color, event_colors_map):
+    # 색상 결정 (V93 로직)
+    evt_color_id = event.get('colorId')
+    if evt_color_id:
+        if evt_color_id in event_colors_map:
+            return event_colors_map[evt_color_id]['background']
+        elif evt_color_id in FALLBACK_EVENT_COLORS:
+            return FALLBACK_EVENT_COLORS[evt_color_id]
+    return default_color
+
+def iter_event_pages(service, cal_id, time_min, time_max, http=None):
+    """한 캘린더의 일정을 페이지 단위로 내보낸다. nextPageToken 이 없을 때까지 계속."""
+    page_token = None
+    while True:
+        events_result = execute_with_backoff(service.events().list(
+            calendarId=cal_id, timeMin=time_min, timeMax=time_max,
+            maxResults=PAGE_SIZE, singleEvents=True, orderBy='startTime',
+            pageToken=page_token, **lean_fields(EVENT_LIST_FIELDS)
+        ), http=http)
+        yield events_result.get('items', [])
+        page_token = events_result.get('nextPageToken')
+        if not page_token: break
+
+def _fetch_calendar_worker(service, cal_id, time_min, time_max, out_q, store=None, report=None):
+    # 워커는 ('page'* → 'done' | 'error') 순서로 큐에 메시지를 보냄
+    t0 = time.perf_counter()
+    api_pages = 0
+    try:
+        http = _thread_http(service)
+        if store is not None:
+            # 바뀐 일정만 받아서 저장소에 반영한 뒤, 저장소에서 범위만큼 읽음
+            api_pages = store.sync(service, cal_id, time_min, time_max, http=http)
+            page_iter = store.iter_events(cal_id, time_min, time_max)
+        else:
+            page_iter = iter_event_pages(service, cal_id, time_min, time_max, http=http)
+
+        for items in page_iter:
+            if store is None: api_pages += 1
+            out_q.put(('page', cal_id, items))
+        if report: report.calendar(cal_id, sec=time.perf_counter() - t0, pages=api_pages)
+        out_q.put(('done', cal_id, api_pages))
+    except Exception as e:
+        if report: report.calendar(cal_id, sec=time.perf_counter() - t0, pages=api_pages, error=str(e))
+        out_q.put(('error', cal_id, e))
+
+def describe_error(cal_id, error):
+    if is_rate_limited(error):
+        return f"❌ [{cal_id}] 요청 한도 초과: 잠시 후 다시 시도해주세요"
+    if error_status(error) in (403, 404):
+        return f"❌ [{cal_id}] 접근 불가: 로봇 공유 확인 필요"
+    return f"❌ [{cal_id}] 가져오기 실패: {error}"
+
+# --- [날짜별 그룹핑] ---
+class DayIndex:
+    """일정을 (첫날, 마지막날) 구간으로 모아 두었다가, 한 번의 스윕으로 날짜별 목록을 만든다.
+
+    예전처럼 일정마다 하루씩 while 을 돌며 날짜 목록에 넣고 날짜마다 다시 정렬하지 않고,
+    전체를 한 번 정렬한 뒤 날짜 순으로 지나가며 '지금 걸쳐 있는 일정'만 관리한다.
+    날짜별 목록은 Event 튜플(읽기 전용)이고, 걸친 일정이 바뀌지 않은 날끼리는 같은 튜플을 공유한다.
+
+    같은 날 종일 일정끼리, 시작 시각이 같은 시간 일정끼리는 (캘린더 순서, 그 캘린더 안에서 들어온 순서)로 줄 세운다.
+    캘린더마다 페이지는 순서대로 들어오므로, 여러 캘린더가 어떤 순서로 섞여 도착해도 결과가 같다.
+    calendar_order 에 없는 캘린더는 처음 보인 순서대로 그 뒤에 붙는다.
+
+    merge(먼저 들어온 사본, 새 사본) 를 주면 duplicate_key 가 같은 일정은 새로 넣지 않고
+    이미 넣어 둔 자리를 합친 일정으로 바꾼다 (자리는 두 사본 중 앞선 쪽 기준).
+    """
+
+    def __init__(self, start_date, end_date, merge=None, calendar_order=()):
+        self.start_date = start_date
+        self.end_date = end_date
+        self._first = start_date.toordinal()
+        self._last = end_date.toordinal()
+        self._allday = []  # (첫날, 순번, 마지막날, 일정)
+        self._timed = []   # (시작 시각, 순번, 첫날, 마지막날, 일정)
+        self._cal_rank = {cal_id: i for i, cal_id in enumerate(dict.fromkeys(calendar_order))}
+        self._cal_pos = {}  # 캘린더 ID → 지금까지 들어온 일정 수
+        self._merge = merge
+        self._slots = {}   # 중복 키 → (목록, 위치)
+        self.merged = 0    # 합쳐서 없어진 사본 수
+
+    def __len__(self):
+        return len(self._allday) + len(self._timed)
+
+    def _next_seq(self, cal_id):
+        # 순번 = (캘린더 순서, 그 캘린더 안에서 몇 번째) → 도착 순서와 상관없이 정해짐
+        rank = self._cal_rank.setdefault(cal_id, len(self._cal_rank))
+        pos = self._cal_pos.get(cal_id, 0)
+        self._cal_pos[cal_id] = pos + 1
+        return rank, pos
+
+    def add(self, event):
+        # [V95 핵심 로직] 날짜 계산 (Overnight 지원) - event 는 event_model.Event
+        seq = self._next_seq(event.calendar_id)
+        key = duplicate_key(event) if self._merge is not None else None
+        slot = self._slots.get(key) if key is not None else None
+        if slot is not None:
+            entries, i = slot
+            entry = entries[i]
+            entries[i] = (entry[0], min(entry[1], seq)) + entry[2:-1] + (self._merge(entry[-1], event),)
+            self.merged += 1
+            return
+        # 1. 종일 일정 처리
+        if event.all_day:
+            first = event.start.toordinal()
+            # 종일 일정은 종료일이 '다음날 0시'로 표기됨. 따라서 실제 종료일은 -1일
+            last = event.end.toordinal() - 1
+            first, last = max(first, self._first), min(last, self._last)
+            if first <= last:
+                self._allday.append((first, seq, last, event))
+                if key is not None: self._slots[key] = (self._allday, len(self._allday) - 1)
+
+        # 2. 시간 일정 처리 (수면 시간 등)
+        else:
+            dt_end = event.end
+            first = event.start.toordinal()
+            last = dt_end.toordinal()
+            # 만약 종료 시간이 00:00:00 이라면, 날짜 상으로는 전날까지만 포함된 것으로 봄
+            if dt_end.hour == 0 and dt_end.minute == 0 and dt_end.second == 0:
+                last -= 1
+            first, last = max(first, self._first), min(last, self._last)
+            if first <= last:
+                self._timed.append((event.start, seq, first, last, event))
+                if key is not None: self._slots[key] = (self._timed, len(self._timed) - 1)
+
+    def build(self):
+        """{날짜: {'allday': (...), 'timed': (...)}} 를 만든다. timed 는 원래 시작 시간 순."""
+        # 종일: 첫날 → 캘린더 순서 → 캘린더 안 순서 / 시간: 원래 시작 시간 순 (시작 시간 순이면 첫날 순서도 보장됨)
+        allday = [(first, last, event) for first, _, last, event in sorted(self._allday, key=lambda x: x[:2])]
+        timed = [(first, last, event) for _, _, first, last, event in sorted(self._timed, key=lambda x: x[:2])]
+        allday_views = self._sweep(allday)
+        timed_views = self._sweep(timed)
+        daily_groups = {}
+        for i, day in enumerate(range(self._first, self._last + 1)):
+            daily_groups[date.fromordinal(day)] = {'allday': allday_views[i], 'timed': timed_views[i]}
+        return daily_groups
+
+    def _sweep(self, items):
+        # items 는 (첫날, 마지막날, 일정) 을 정렬 순서대로 담은 목록
+        views = []
+        active = []           # 지금 걸쳐 있는 (마지막날, 일정)
+        view = ()
+        next_expiry = None    # active 중 가장 먼저 끝나는 날
+        i, n = 0, len(items)
+        for day in range(self._first, self._last + 1):
+            changed = False
+            if next_expiry is not None and next_expiry < day:
+                active = [a for a in active if a[0] >= day]
+                changed = True
+            while i < n and items[i][0] == day:
+                active.append((items[i][1], items[i][2]))
+                i += 1
+                changed = True
+            if changed:
+                view = tuple(evt for _, evt in active)
+                next_expiry = min(a[0] for a in active) if active else None
+            views.append(view)
+        return views
+
+# --- [메인 진입점] ---
+def get_events_from_ids(service, target_ids, custom_colors, start_date, end_date, store=None, report=None,
+                        dedupe=None, priority=None):
+    """report(GenerationReport)를 넘기면 캘린더별 시간/페이지 수와 가져오기·그룹핑 단계 시간을 기록.
+
+    dedupe(기본 DEDUPE_EVENTS)면 여러 캘린더에 들어 있는 같은 일정을 하나로 합친다.
+    priority(캘린더 ID 목록)에서 앞선 캘린더의 색이 대표가 되고, 목록에 없는 캘린더는 입력 순서대로 그 뒤.
+    """
+    if not target_ids: return {}, {}, ["❌ 캘린더 ID를 입력해주세요."]
+
+    t0 = time.perf_counter()
+    cal_colors_map, event_colors_map = get_google_colors(service)
+
+    # 검색 범위: 시작일 전날 ~ 종료일 다음날 (안전하게)
+    search_start = datetime.combine(start_date, datetime.min.time()) - timedelta(days=1)
+    search_end = datetime.combine(end_date, datetime.max.time()) + timedelta(days=1)
+    time_min = search_start.isoformat() + 'Z'
+    time_max = search_end.isoformat() + 'Z'
+
+    # 같은 ID가 두 번 들어와도 한 번만 가져옴 (입력 순서 유지)
+    cal_ids = list(dict.fromkeys(c.strip() for c in target_ids if c.strip()))
+
+    cal_legend_info = {}
+    merge = None
+    if dedupe is None: dedupe = DEDUPE_EVENTS
+    if dedupe:
+        order = list(dict.fromkeys([*(priority or []), *cal_ids]))
+        rank = {cal_id: i for i, cal_id in enumerate(order)}
+        calendar_names = {}  # 아래에서 범례를 채우면서 같이 채움
+        merge = functools.partial(merge_copies, rank=rank.__getitem__, calendar_names=calendar_names)
+    day_index = DayIndex(start_date, end_date, merge=merge, calendar_order=cal_ids)
+    if not cal_ids: return day_index.build(), cal_legend_info, []
+
+    cal_errors = {}
+    cal_infos = get_calendar_infos(service, cal_ids)
+    if report: report.add('calendar_info', sec=time.perf_counter() - t0, calendars=len(cal_ids))
+    for cal_id, cal_info in cal_infos.items():
+        if isinstance(cal_info, Exception):
+            cal_errors[cal_id] = cal_info
+            continue
+        cal_name = cal_info.get('summary', cal_id)
+        if cal_id in custom_colors:
+            default_color = custom_colors[cal_id]
+        else:
+            cal_color_id = cal_info.get('colorId', '1')
+            default_color = cal_colors_map.get(cal_color_id, {'background': '#a4bdfc'})['background']
+        cal_legend_info[cal_id] = {'name': cal_name, 'color': default_color}
+        if merge is not None: calendar_names[cal_id] = cal_name
+
+    fetch_ids = [cal_id for cal_id in cal_ids if cal_id in cal_legend_info]
+    cal_counts = {cal_id: 0 for cal_id in fetch_ids}
+    out_q = queue.Queue()
+    group_sec = 0.0
+
+    t0 = time.perf_counter()
+    if fetch_ids:
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(fetch_ids))) as pool:
+            for cal_id in fetch_ids:
+                pool.submit(_fetch_calendar_worker, service, cal_id, time_min, time_max, out_q, store, report)
+
+            # 페이지가 도착하는 대로 그룹핑 (다른 캘린더는 계속 내려받는 중)
+            remaining = len(fetch_ids)
+            while remaining:
+                kind, cal_id, payload = out_q.get()
+                if kind == 'page':
+                    g0 = time.perf_counter()
+                    meta = cal_legend_info[cal_id]
+                    for item in payload:
+                        # 원본 dict 는 여기서 버리고, 필요한 필드만 담은 Event 로 넘김
+                        event = event_from_api(item, cal_id, meta['name'],
+                                               resolve_event_color(item, meta['color'], event_colors_map))
+                        if event is not None: day_index.add(event)
+                    cal_counts[cal_id] += len(payload)
+                    group_sec += time.perf_counter() - g0
+                else:
+                    if kind == 'error': cal_errors[cal_id] = payload
+                    remaining -= 1
+
+    fetch_sec = time.perf_counter() - t0
+
+    g0 = time.perf_counter()
+    daily_groups = day_index.build()
+    group_sec += time.perf_counter() - g0
+    if report:
+        report.add('fetch', sec=fetch_sec, events=sum(cal_counts.values()))
+        report.add('group', sec=group_sec, events=len(day_index), days=len(daily_groups), duplicates=day_index.merged)
+        for cal_id in fetch_ids:
+            report.calendar(cal_id, name=cal_legend_info[cal_id]['name'], events=cal_counts[cal_id])
+
+    # 로그는 입력 순서대로 정리
+    log_msg = []
+    for cal_id in cal_ids:
+        if cal_id in cal_errors:
+            log_msg.append(describe_error(cal_id, cal_errors[cal_id]))
+            if cal_counts.get(cal_id):
+                # 앞 페이지들은 이미 날짜별로 들어가 있음 -> 이 캘린더는 일부만 책에 실림
+                log_msg.append(f"⚠️ [{cal_legend_info[cal_id]['name']}] : 중간에 실패해서 "
+                               f"먼저 받은 {cal_counts[cal_id]}개만 들어갔습니다 (나머지는 빠짐)")
+            continue
+        meta = cal_legend_info[cal_id]
+        if cal_counts[cal_id]:
+            log_msg.append(f"✅ [{meta['name']}] : {cal_counts[cal_id]}개")
+        else:
+            log_msg.append(f"⚠️ [{meta['name']}] : 일정 없음")
+    if day_index.merged:
+        log_msg.append(f"🔗 여러 캘린더에 같이 있는 일정 {day_index.merged}개를 하나로 합쳤습니다.")
+
+    return daily_groups, cal_legend_info, log_msg
@@ -0,0 +1,779 @@
+# ==========================================
+# [시온이네 일기장] 렌더링 (HTML → PDF)
+# ==========================================
+# 1. 하루치 HTML 생성(generate_day_html)과 WeasyPrint PDF 생성(create_full_pdf)
+# 2. 긴 기간은 주/월 단위 덩어리로 나눠 프로세스 풀에서 동시에 렌더링한 뒤,
+#    날짜 순서대로 한 PDF로 합침 (create_full_pdf_parallel)
+# 3. 아주 긴 기간은 월/분기별 여러 권으로 나눠서 디스크에 바로 씀 (write_volumes)
+#    -> 결과물을 메모리(bytes)에 들고 있지 않으므로 기간이 길어도 메모리가 일정함
+# 4. page_cache(PageCache)를 넘기면 날짜별 내용 해시로 달마다 렌더링 결과를 재사용하고,
+#    내용이 바뀐 날이 든 달만 다시 WeasyPrint 에 넣음
+#
+# 프로세스 풀 워커가 import 할 수 있어야 하므로 Streamlit 과 분리된 모듈로 둠
+# WeasyPrint 는 import 만 해도 무거우므로(Pango/폰트 라이브러리 로딩) 처음 Renderer 를 만들 때 불러옴
+#   -> 앱 첫 화면(미리보기 HTML 포함)은 WeasyPrint 없이 뜸
+
+import functools
+import hashlib
+import html
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from calendar_fetch import KST
+from instrument import rss_mb
+from timeline_layout import layout_timeline
+
+# --- [1. 텍스트 / 시간 표기] ---
+def force_break_text(text):
+    if not text: return ""
+    chunk_size = 15
+    return '<wbr>'.join([text[i:i+chunk_size] for i in range(0, len(text), chunk_size)])
+
+def get_time_info(event):
+    start_dt = event.start
+    end_dt = event.end
+    
+    # 단순 표기용 텍스트 (원본 시간 그대로 표시)
+    time_range = f"{start_dt.strftime('%H:%M')} - {end_dt.strftime('%H:%M')}"
+    
+    duration = end_dt - start_dt
+    total_seconds = int(duration.total_seconds())
+    h, r = divmod(total_seconds, 3600)
+    m = r // 60
+    dur_str = []
+    if h > 0: dur_str.append(f"{h}h")
+    if m > 0: dur_str.append(f"{m}m")
+    if not dur_str: dur_str.append("0m")
+    
+    # 날짜가 다르면 표시 (예: +1)
+    if start_dt.date() != end_dt.date():
+        days_diff = (end_dt.date() - start_dt.date()).days
+        if days_diff > 0:
+             time_range += f" (+{days_diff})"
+             
+    return time_range, " ".join(dur_str)
+
+# --- [2. HTML / PDF 생성] ---
+FONT_SCALE = 1.0  # 기본 글자 크기 배율 (UI에서 고른 값은 font_scale 인자로 넘김)
+
+def get_scaled_size(pt, font_scale=FONT_SCALE):
+    return f"{pt * font_scale}pt"
+
+# --- [HTML 템플릿] ---
+# 템플릿은 모듈을 읽을 때 한 번만 만들어 두고, 조각은 리스트에 모았다가 마지막에 한 번만 join
+WEEKDAY_KR = ['월', '화', '수', '목', '금', '토', '일']
+COL_HEIGHT = 950 
+PIXELS_PER_MIN = COL_HEIGHT / 1440
+TOP_OFFSET = 10
+GUTTER_PCT = 6.0
+EXPAND_TIMELINE_LANES = False  # True 면 겹친 일정이 오른쪽 빈 칸까지 넓게 그려짐
+# 타임라인 그리기 방식: 'html' = 눈금/라벨/일정마다 div, 'svg' = 하루에 인라인 SVG 하나
+# (svg 는 WeasyPrint 가 레이아웃할 상자가 하루 수십 개 → 몇 개로 줄어듦)
+# 프로세스 풀 워커도 같은 값을 쓰도록 환경 변수로 받음
+TIMELINE_BACKEND = os.environ.get('DIARY_TIMELINE_BACKEND', 'html')
+
+_LEGEND_ROW = "<div class='legend-row'><span class='legend-box' style='background-color:{color}'></span><span class='legend-text'>{name}</span></div>".format
+
+_DAY_OPEN = """
+    <div class='day-container'>
+        <div class='first-page-container'>
+            <div class='header-wrapper-full'>
+                <div class='date-header'>{date_str}</div>
+                <div class='legend-container'>{legend_rows}</div>
+            </div>
+            <div class='header-line-full'></div>
+            
+            <div class='content-wrapper'>
+                <div class='text-column'> 
+                    <div class='visual-page'>
+                        <div class='timeline-col'>
+    """.format
+
+_TIMELINE_CLOSE = """
+                        </div>
+                    </div> 
+                </div> 
+                <div class='memo-column'></div>
+            </div>
+        </div> 
+    """
+
+_EVENT_BLOCK = "<div class='event-block' style='top:{top}px; height:{height}px; left:{left}%; width:{width}%; background-color:{bg}40; border-left:3px solid {bg}; color:#333; font-size:{font_size}; line-height:1.2; z-index:20; {wrap_style}'><b>{summary}</b></div>".format
+_WRAP_SHORT = "white-space: nowrap; overflow: hidden; text-overflow: ellipsis;"
+_WRAP_NORMAL = "white-space: normal; overflow: hidden;"
+
+# "(계속)" 본문은 flex(content-wrapper) 없이 폭만 정한 블록 하나에 담음
+# WeasyPrint 는 여러 쪽에 걸친 flex 상자를 나눌 때 매우 느려서 (benchmarks/bench_paginate.py 참고)
+# 오른쪽 메모 칸은 비어 있으므로 블록 폭(75%)만 맞추면 쪽 수는 같음 (쪽 끝에서 끊기는 줄은 조금 다를 수 있음)
+_TEXT_OPEN = """
+        <div class='date-header-running'>{date_str} (계속)</div>
+        <div class='text-pages-wrapper'>
+            <div class='text-page'>
+        """.format
+_TEXT_CLOSE = "</div></div>"
+
+_ALLDAY_ITEM = "<div class='text-item'><div class='allday-styled' style='border-color:{color};'><span class='text-title' style='color:{color};'>[종일] {summary}</span><div class='text-desc'>{desc}</div></div></div>".format
+_TIMED_ITEM = "<div class='text-item'><span class='text-meta'><span style='color:{color}; font-weight:800; margin-right:5px;'>[{cal_name}]</span>{t_range} ({dur_str})</span><span class='text-title' style='color:{color};'>{summary}</span><div class='text-desc'>{desc}</div></div>".format
+
+def _build_timeline_grid():
+    # 0~24시 눈금선/시간 라벨은 매일 똑같으므로 한 번만 만들어 둠
+    parts = []
+    span_style = "background-color:white; padding-right:2px;" 
+    for h in range(25):
+        top = (h * 60 * PIXELS_PER_MIN) + TOP_OFFSET
+        parts.append(f"<div class='grid-line' style='top:{top}px;'></div>")
+        
+        label_top = top - 7
+        if h == 24: label_top = top - 10
+        
+        base_style = f"top:{label_top}px; left:0; width:30px; text-align:left; background-color:transparent; z-index:10;"
+        
+        if h % 3 == 0 or h == 24: 
+             parts.append(f"<div class='time-label' style='{base_style}'><span style='{span_style} color:#000; font-weight:bold;'>{h}</span></div>")
+        else:
+             parts.append(f"<div class='time-label' style='{base_style}'><span style='{span_style} font-size:6pt; color:#666;'>{h}</span></div>")
+    return "".join(parts)
+
+_TIMELINE_GRID = _build_timeline_grid()
+
+# --- [SVG 타임라인] ---
+# 인라인 SVG 끼리는 <defs>/<use> 로 서로 참조할 수 없으므로, 눈금/라벨은 SVG 조각 하나로 미리 만들어 두고
+# 매일 그대로 붙임. SVG 안의 요소는 WeasyPrint 레이아웃 상자가 아니라 그리기 명령이라 비용이 작음
+# 좌표: y 는 px (HTML 방식과 같은 TOP_OFFSET/PIXELS_PER_MIN), x/폭은 타임라인 폭 대비 %
+PX_PER_PT = 96 / 72
+# 타임라인 폭: A4 에서 @page margin 1.5cm 와 기본 body margin 8px 를 뺀 폭의 75% (.text-column)
+# 일정 제목 줄바꿈에만 씀. build_css 의 여백/칼럼 폭을 바꾸면 같이 볼 것
+TIMELINE_WIDTH_PX = ((210 - 2 * 15) * 96 / 25.4 - 2 * 8) * 0.75
+
+# SVG 글자는 body 의 font-family 를 물려받지 않으므로 (영문/숫자가 기본 폰트로 그려짐) 직접 지정
+_SVG_OPEN = (f"<svg class='timeline-svg' width='100%' height='{COL_HEIGHT + 2 * TOP_OFFSET}' style='overflow:visible'"
+             " font-family='NanumGothic, sans-serif'>")
+_SVG_EVENT = ("<rect x='{left}%' y='{top}' width='{width}%' height='{height}' rx='6' fill='{bg}' fill-opacity='0.25' stroke='white'/>"
+              "<rect x='{left}%' y='{top}' width='3' height='{height}' fill='{bg}'/>"
+              "<text x='{left}%' y='{top}' dx='5' font-size='{font_size}' font-weight='bold' fill='#333'>{lines}</text>").format
+_SVG_LINE = "<tspan x='{left}%' dx='5' dy='{dy}'>{text}</tspan>".format
+
+def _build_svg_grid():
+    parts = []
+    for h in range(25):
+        top = (h * 60 * PIXELS_PER_MIN) + TOP_OFFSET
+        parts.append(f"<line x1='0' x2='100%' y1='{top}' y2='{top}' stroke='#bbb' stroke-dasharray='3,3'/>")
+        label_y = top - 3 if h == 24 else top  # HTML 방식처럼 24 만 3px 위로
+        major = h % 3 == 0 or h == 24
+        size, color, weight = ('7pt', '#000', 'bold') if major else ('6pt', '#666', 'normal')
+        # 라벨 뒤 흰 바탕 (HTML 방식의 흰 span 과 같은 역할)
+        parts.append(f"<rect x='0' y='{label_y - 5}' width='{6 + 5 * len(str(h))}' height='10' fill='white'/>")
+        parts.append(f"<text x='0' y='{label_y}' dy='3' font-size='{size}' font-weight='{weight}' fill='{color}'>{h}</text>")
+    return "".join(parts)
+
+_SVG_GRID = _build_svg_grid()
+
+def _char_em(ch):
+    # 나눔고딕 글자 폭 (글자 크기 배수, NanumGothic.ttf 기준. 굵은 글씨도 폭은 같음)
+    if ch == ' ': return 0.28
+    if ch < '\u1100': return 0.65 if 'A' <= ch <= 'Z' else 0.55  # 영문/숫자/기호
+    if '\u2e80' <= ch <= '\ud7a3': return 0.94                   # 한자/한글
+    return 1.0                                                   # 이모지 등 (다른 폰트로 그려짐)
+
+def _text_width(text, font_px):
+    return font_px * sum(map(_char_em, text))
+
+def _wrap_svg_text(text, max_px, font_px, max_lines):
+    """SVG 는 줄바꿈을 안 해 주므로 폭에 맞춰 줄을 나누고, 넘치면 마지막 줄을 '…' 로 자른다.
+
+    HTML 방식(white-space: normal)처럼 띄어쓰기에서 끊고, 한 단어가 줄보다 길 때만 글자 단위로 끊음.
+    """
+    lines = []
+    line = ""
+    for c in text:
+        if _text_width(line + c, font_px) > max_px and line:
+            cut = line.rfind(' ') if c != ' ' else -1
+            if cut > 0:
+                lines.append(line[:cut])
+                line = line[cut + 1:]
+            else:
+                lines.append(line.rstrip())
+                line = ""
+            if len(lines) == max_lines: break
+            if c == ' ' and not line: continue  # 줄 첫머리의 띄어쓰기는 버림
+        line += c
+    else:
+        if line: lines.append(line)
+        return lines
+    last = lines[-1]
+    while last and _text_width(last + "…", font_px) > max_px: last = last[:-1]
+    lines[-1] = last + "…"
+    return lines
+
+def _write_timeline_svg(out, placements, font_scale):
+    font_px = 7.5 * font_scale * PX_PER_PT
+    line_px = font_px * 1.2
+    font_size = get_scaled_size(7.5, font_scale)
+    out.append(_SVG_OPEN)
+    out.append(_SVG_GRID)
+    for placement in placements:
+        item = placement.item
+        height = item['_dur'] * PIXELS_PER_MIN
+        left = GUTTER_PCT + (placement.left * (100 - GUTTER_PCT) / 100)
+        width = placement.width * (100 - GUTTER_PCT) / 100
+        max_lines = 1 if item['_dur'] <= 30 else max(1, int((height - 2) // line_px))
+        lines = _wrap_svg_text(item['summary'], TIMELINE_WIDTH_PX * width / 100 - 8, font_px, max_lines)
+        out.append(_SVG_EVENT(
+            top=(item['_s'] * PIXELS_PER_MIN) + TOP_OFFSET, height=height, left=left, width=width,
+            bg=item['bg'], font_size=font_size,
+            lines="".join(_SVG_LINE(left=left, dy=font_px if i == 0 else line_px, text=html.escape(line))
+                          for i, line in enumerate(lines)),
+        ))
+    out.append("</svg>")
+
+def _write_timeline_html(out, placements, font_scale):
+    font_size = get_scaled_size(7.5, font_scale)
+    out.append(_TIMELINE_GRID)
+    for placement in placements:
+        item = placement.item
+        out.append(_EVENT_BLOCK(
+            top=(item['_s'] * PIXELS_PER_MIN) + TOP_OFFSET,
+            height=item['_dur'] * PIXELS_PER_MIN,
+            left=GUTTER_PCT + (placement.left * (100 - GUTTER_PCT) / 100),
+            width=placement.width * (100 - GUTTER_PCT) / 100,
+            bg=item['bg'], font_size=font_size,
+            wrap_style=_WRAP_SHORT if item['_dur'] <= 30 else _WRAP_NORMAL,
+            summary=item['summary']
+        ))
+
+def build_visual_events(target_date, timed):
+    visual_events = []
+    
+    # [V95] 타임라인 시각화 로직 수정 (Clamping)
+    # 현재 그리는 날짜(target_date)의 00:00 ~ 24:00 기준
+    day_start_dt = datetime.combine(target_date, datetime.min.time()).replace(tzinfo=KST)
+    day_end_dt = day_start_dt + timedelta(days=1)
+
+    for evt in timed:
+        evt_start = evt.start
+        evt_end = evt.end
+        
+        # 1. 시각화용 시작/종료 시간 계산 (Clamping)
+        # 이벤트가 어제 시작했으면, 오늘 0시부터 시작한 것으로 간주
+        vis_start = max(evt_start, day_start_dt)
+        # 이벤트가 내일 끝나면, 오늘 24시까지만 그리기
+        vis_end = min(evt_end, day_end_dt)
+        
+        # 만약 계산된 시작 >= 종료라면 (오류 방지), 그리지 않음
+        if vis_start >= vis_end:
+            continue
+
+        # 분 단위 변환 (오늘 0시 기준)
+        s_min = (vis_start - day_start_dt).total_seconds() / 60
+        e_min = (vis_end - day_start_dt).total_seconds() / 60
+        
+        # 좌표 계산
+        if e_min > 1440: e_min = 1440 # 안전장치
+        
+        visual_duration = max(e_min - s_min, 30) # 최소 높이 보장
+        
+        visual_events.append({
+            'summary': evt.summary, 'cal': evt.calendar_name, 'bg': evt.color,
+            '_s': s_min,
+            '_e': s_min + visual_duration, 
+            '_dur': visual_duration
+        })
+    return visual_events
+
+def new_render_stats():
+    # 렌더링 계측값 (워커 프로세스에서도 채워서 돌려줌)
+    return {'days': 0, 'layout_sec': 0.0, 'layout_events': 0, 'html_sec': 0.0, 'html_bytes': 0,
+            'render_sec': 0.0, 'pages': 0, 'cached_days': 0, 'peak_rss_mb': 0.0}
+
+def merge_render_stats(total, part):
+    for key, value in part.items():
+        total[key] = max(total[key], value) if key == 'peak_rss_mb' else total[key] + value
+    return total
+
+def write_day_html(out, target_date, data, cal_legend_info, ordered_ids, font_scale=FONT_SCALE, stats=None):
+    """하루치 HTML 조각들을 out(list)에 덧붙인다. 일정이 없는 날은 아무것도 안 씀."""
+    allday = data['allday']
+    timed = data['timed']
+    if not allday and not timed: return
+    date_str = f"{target_date.strftime('%Y-%m-%d')} ({WEEKDAY_KR[target_date.weekday()]})"
+    
+    used_cal_ids = {evt.calendar_id for evt in allday} | {evt.calendar_id for evt in timed}
+    
+    legend_rows = []
+    for cal_id in ordered_ids:
+        if cal_id in used_cal_ids:
+            info = cal_legend_info.get(cal_id)
+            if info: legend_rows.append(_LEGEND_ROW(color=info['color'], name=info['name']))
+
+    out.append(_DAY_OPEN(date_str=date_str, legend_rows="".join(legend_rows)))
+
+    t0 = time.perf_counter()
+    placements = layout_timeline(build_visual_events(target_date, timed), expand=EXPAND_TIMELINE_LANES)
+    if stats is not None:
+        stats['days'] += 1
+        stats['layout_sec'] += time.perf_counter() - t0
+        stats['layout_events'] += len(placements)
+    if TIMELINE_BACKEND == 'svg': _write_timeline_svg(out, placements, font_scale)
+    else: _write_timeline_html(out, placements, font_scale)
+    out.append(_TIMELINE_CLOSE)
+    
+    out.append(_TEXT_OPEN(date_str=date_str))
+    for evt in allday:
+        out.append(_ALLDAY_ITEM(
+            color=evt.color, summary=evt.summary,
+            desc=force_break_text(evt.description).replace('\\n', '<br>')
+        ))
+    for evt in timed:
+        t_range, dur_str = get_time_info(evt)
+        out.append(_TIMED_ITEM(
+            color=evt.color, cal_name=evt.calendar_name,
+            t_range=t_range, dur_str=dur_str, summary=evt.summary,
+            desc=force_break_text(evt.description).replace('\\n', '<br>')
+        ))
+    out.append(_TEXT_CLOSE)
+    out.append("</div>")
+
+def generate_day_html(target_date, data, cal_legend_info, ordered_ids, font_scale=FONT_SCALE):
+    out = []
+    write_day_html(out, target_date, data, cal_legend_info, ordered_ids, font_scale)
+    return "".join(out)
+
+# 미리보기: WeasyPrint 없이 브라우저에 바로 보여줄 하루치 HTML 문서
+# 브라우저는 @page/running() 을 모르므로 본문 폭을 A4 본문 폭에 맞추고 반복 머리글은 숨김
+PREVIEW_WIDTH_PX = 680
+_PREVIEW_CSS = f"""
+        body {{ width: {PREVIEW_WIDTH_PX}px; margin: 0 auto; background: white; }}
+        .date-header-running {{ display: none; }}
+"""
+
+def browser_css(font_scale=FONT_SCALE):
+    # 브라우저/전자책에서 볼 때 쓰는 CSS (미리보기, html_export)
+    return build_css(font_scale) + _PREVIEW_CSS
+
+def preview_day_html(target_date, data, cal_legend_info, ordered_ids, font_scale=FONT_SCALE):
+    day_html = generate_day_html(target_date, data, cal_legend_info, ordered_ids, font_scale)
+    return f"<html><head><meta charset='utf-8'><style>{browser_css(font_scale)}</style></head><body>{day_html}</body></html>"
+
+def build_book_html(daily_data, cal_legend_info, ordered_ids, font_scale=FONT_SCALE, stats=None):
+    t0 = time.perf_counter()
+    out = ["<html><body>"]
+    for d, events in sorted(daily_data.items()):
+        write_day_html(out, d, events, cal_legend_info, ordered_ids, font_scale, stats)
+    out.append("</body></html>")
+    html = "".join(out)
+    if stats is not None:
+        stats['html_sec'] += time.perf_counter() - t0
+        stats['html_bytes'] += len(html.encode())
+    return html
+
+@functools.lru_cache(maxsize=8)
+def build_css(font_scale=FONT_SCALE):
+    body_font = get_scaled_size(8.5, font_scale)
+    meta_font = get_scaled_size(7.5, font_scale)
+    title_font = get_scaled_size(10, font_scale)
+    
+    css_style = f"""
+        @page {{ size: A4; margin: 1.5cm; }}
+        
+        @page text_layer {{
+            margin-top: 2.5cm; 
+            @top-center {{
+                content: element(headerContent); 
+                width: 100%;
+            }}
+        }}
+        
+        body {{ font-family: 'NanumGothic', sans-serif; color: #333; line-height: 1.35; font-size: {body_font}; }}
+        
+        .day-container {{ page-break-after: always; }}
+        .first-page-container {{
+            display: inline-block; width: 100%;
+            page-break-inside: avoid; break-inside: avoid; margin-bottom: 20px;
+        }}
+        
+        .header-wrapper-full {{ display: flex; justify-content: space-between; align-items: flex-end; margin-bottom: 5px; width: 100%; background-color: white;}}
+        .header-line-full {{ width: 100%; height: 2px; background-color: #5d4037; margin-bottom: 10px; }}
+
+        .date-header {{ font-size: 16pt; font-weight: bold; color: #3e2723; margin: 0; padding: 0; }}
+        
+        .legend-container {{ text-align: right; }}
+        .legend-row {{ display: flex; align-items: center; justify-content: flex-end; margin-bottom: 2px; }}
+        .legend-box {{ display: inline-block; width: 8px; height: 8px; margin-right: 5px; border-radius: 2px; border: 1px solid #ccc; }}
+        .legend-text {{ font-size: 7pt; color: #666; }}
+        
+        .visual-page {{ width: 100%; height: 970px; position: relative; overflow: visible; margin-top: 5px; margin-bottom: 10px; }}
+        .timeline-col {{ position: absolute; top: 10px; height: 950px; width: 100%; box-sizing: border-box; }}
+        
+        .grid-line {{ position: absolute; left: 0; width: 100%; height: 0; border-top: 1px dashed #bbb; z-index: 0; }}
+        
+        .time-label {{ position: absolute; left: 0; font-size: 7pt; font-weight: bold; color: #666; background-color: transparent; padding-right: 5px; z-index: 10; width: 30px; text-align: left; }}
+        
+        .event-block {{ position: absolute; border-radius: 6px; padding: 1px 3px; border: 1px solid white; box-shadow: 1px 1px 1px rgba(0,0,0,0.1); display: flex; flex-direction: column; justify-content: flex-start; z-index: 20; box-sizing: border-box; overflow: hidden; }}
+        
+        .date-header-running {{ 
+            position: running(headerContent); 
+            font-size: 16pt; font-weight: bold; color: #3e2723; 
+            border-bottom: 2px solid #5d4037; 
+            padding-bottom: 5px; margin-bottom: 20px; 
+            width: 100%; text-align: left;
+        }}
+        
+        .text-pages-wrapper {{
+            page: text_layer;
+        }}
+        
+        .text-page {{ width: 75%; }}
+        
+        .content-wrapper {{ display: flex; width: 100%; }} 
+        .text-column {{ width: 75%; padding-right: 2%; }} 
+        .memo-column {{ width: 23%; }} 
+        
+        .text-item {{ 
+            margin-bottom: 15px; padding-bottom: 5px; border-bottom: 1px solid #f9f9f9; width: 100%; 
+            page-break-inside: auto; break-inside: auto; orphans: 1; widows: 1;
+        }}
+        .allday-styled {{ background-color: #fff8e1; padding: 8px; border-radius: 6px; border-left: 3px solid; }}
+        
+        .text-meta {{ display: block; font-size: {meta_font}; color: #888; font-weight: bold; margin-bottom: 1px; break-after: avoid; page-break-after: avoid; }}
+        .text-title {{ display: block; font-size: {title_font}; font-weight: bold; margin-bottom: 3px; break-after: avoid; page-break-after: avoid; }}
+        
+        .text-desc {{ 
+            font-size: {body_font}; color: #444; white-space: pre-wrap; line-height: 1.5; word-break: break-all; overflow-wrap: break-word; 
+            break-inside: auto; 
+        }}
+    """
+    
+    return css_style
+
+# 폰트 설정(FontConfiguration)과 파싱된 CSS 는 렌더링마다 새로 만들지 않고 재사용
+# WeasyPrint 객체는 스레드 안전하지 않으므로 스레드(프로세스 풀 워커는 프로세스)마다 하나씩 둠
+_WARM_UP_HTML = "<html><body><div class='day-container'><b>가나다 ABC 123</b> 가나다 ABC 123</div></body></html>"
+
+class Renderer:
+    def __init__(self):
+        from weasyprint.text.fonts import FontConfiguration
+        self.font_config = FontConfiguration()
+        self._stylesheets = {}  # 글자 크기 → 파싱된 CSS
+
+    def stylesheet(self, font_scale=FONT_SCALE):
+        css = self._stylesheets.get(font_scale)
+        if css is None:
+            from weasyprint import CSS
+            css = self._stylesheets[font_scale] = CSS(string=build_css(font_scale), font_config=self.font_config)
+        return css
+
+    def render(self, html_string, font_scale=FONT_SCALE):
+        from weasyprint import HTML
+        return HTML(string=html_string).render(stylesheets=[self.stylesheet(font_scale)], font_config=self.font_config)
+
+    def warm_up(self, font_scale=FONT_SCALE):
+        # CSS 파싱과 폰트(NanumGothic) 찾기를 미리 해 둬서 첫 책이 그 비용을 내지 않게 함
+        # 다른 글자 크기는 처음 쓸 때 CSS 만 한 번 더 파싱됨 (폰트 설정은 같이 씀)
+        self.render(_WARM_UP_HTML, font_scale)
+
+_thread_local = threading.local()
+
+def get_renderer():
+    renderer = getattr(_thread_local, 'renderer', None)
+    if renderer is None:
+        renderer = _thread_local.renderer = Renderer()
+    return renderer
+
+def warm_up_renderer(font_scale=FONT_SCALE):
+    # 프로세스 풀/작업 스레드 풀의 initializer 로 씀
+    # initializer 가 실패하면 풀 전체가 못 쓰게 되므로, 실패는 실제 렌더링 때 드러나도록 넘김
+    try:
+        get_renderer().warm_up(font_scale)
+    except Exception:
+        pass
+
+def render_document(html_string, font_scale=FONT_SCALE, stats=None):
+    # 레이아웃까지만 하고 PDF 는 아직 안 씀 (페이지 단위로 잘라 쓰기 위해)
+    t0 = time.perf_counter()
+    document = get_renderer().render(html_string, font_scale)
+    if stats is not None:
+        stats['render_sec'] += time.perf_counter() - t0
+        stats['pages'] += len(document.pages)
+        stats['peak_rss_mb'] = max(stats['peak_rss_mb'], rss_mb())
+    return document
+
+def render_pdf(html_string, font_scale=FONT_SCALE, target=None, stats=None):
+    # target(파일 경로/파일 객체)을 주면 bytes 를 만들지 않고 그곳에 바로 씀
+    document = render_document(html_string, font_scale, stats)
+    t0 = time.perf_counter()
+    result = document.write_pdf(target)
+    if stats is not None:
+        stats['render_sec'] += time.perf_counter() - t0
+        stats['peak_rss_mb'] = max(stats['peak_rss_mb'], rss_mb())
+    return result
+
+def create_full_pdf(daily_data, cal_legend_info, ordered_ids, font_scale=FONT_SCALE, target=None, stats=None):
+    return render_pdf(build_book_html(daily_data, cal_legend_info, ordered_ids, font_scale, stats), font_scale, target, stats)
+
+def create_summary_pdf(daily_data, cal_legend_info, ordered_ids, font_scale=FONT_SCALE, stats=None):
+    # 요약 페이지는 NumPy 가 필요해서 켰을 때만 불러옴
+    from book_summary import build_summary_html, summarize
+    body = build_summary_html(summarize(daily_data, ordered_ids), cal_legend_info)
+    return render_pdf(f"<html><body>{body}</body></html>", font_scale, stats=stats)
+
+# --- [3. 병렬 렌더링] ---
+PARALLEL_MIN_DAYS = 31  # 이보다 짧은 기간은 프로세스 풀을 띄우는 비용이 더 큼
+RENDER_WORKERS = os.cpu_count() or 1
+PRELOAD_RENDER_WORKERS = 1  # 앱을 띄울 때 미리 준비해 둘 워커 수 (start_render_pool)
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+def _noop():
+    pass
+
+def _get_render_pool(font_scale=FONT_SCALE):
+    # 워커마다 WeasyPrint import 와 폰트 준비 비용이 크므로 풀은 한 번 만들어서 계속 재사용
+    # Streamlit 서버는 멀티스레드라 fork 대신 spawn 으로 띄움
+    # 동시에 들어온 첫 작업 둘이 풀을 하나씩 만들지 않도록 잠금
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(
+                max_workers=RENDER_WORKERS, mp_context=multiprocessing.get_context('spawn'),
+                initializer=warm_up_renderer, initargs=(font_scale,),
+            )
+        return _render_pool
+
+def start_render_pool(workers=PRELOAD_RENDER_WORKERS, font_scale=FONT_SCALE):
+    """렌더링 풀을 만들고 워커 workers 개를 지금 바로 띄운다 (기다리지 않음). 워커는 font_scale 로 준비해 둠.
+
+    spawn 풀은 작업이 들어올 때 워커를 하나씩 띄우고 initializer 도 그때 돌기 때문에,
+    그냥 두면 준비 비용을 첫 책이 냄. 다만 워커마다 WeasyPrint 를 통째로 들고 있어서
+    미리보기/HTML 만 쓰는 사람에게도 전부 띄우면 첫 화면과 메모리에 부담이 됨
+    -> 미리는 몇 개만 띄우고, 나머지는 첫 PDF 책 때 필요한 만큼 늘어남.
+    """
+    pool = _get_render_pool(font_scale)
+    for _ in range(min(workers, RENDER_WORKERS)):
+        pool.submit(_noop)
+    return pool
+
+def chunk_daily_data(daily_data, chunk_by='month'):
+    """일정이 있는 날만 골라 날짜 순으로 주('week') 또는 월('month') 단위 덩어리로 나눈다."""
+    chunks = []
+    current_key = None
+    for d, events in sorted(daily_data.items()):
+        if not events['allday'] and not events['timed']: continue
+        key = d.isocalendar()[:2] if chunk_by == 'week' else (d.year, d.month)
+        if key != current_key:
+            chunks.append({})
+            current_key = key
+        chunks[-1][d] = events
+    return chunks
+
+def _render_chunk(chunk, cal_legend_info, ordered_ids, font_scale, path):
+    # 결과는 파일로 넘기고 (큰 bytes 를 프로세스 사이로 복사하지 않음), 계측값만 돌려줌
+    stats = new_render_stats()
+    create_full_pdf(chunk, cal_legend_info, ordered_ids, font_scale, target=path, stats=stats)
+    return stats
+
+def merge_pdfs(pdf_parts, target=None):
+    """PDF 조각(파일 경로 또는 bytes)들을 순서대로 합친다. target 이 없으면 bytes 로 돌려줌."""
+    from pypdf import PdfReader, PdfWriter
+    writer = PdfWriter()
+    for part in pdf_parts:
+        writer.append(PdfReader(part if isinstance(part, str) else io.BytesIO(part)))
+    if target is not None:
+        writer.write(target)
+        return None
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+def create_full_pdf_parallel(daily_data, cal_legend_info, ordered_ids, font_scale=FONT_SCALE, chunk_by='month', target=None, stats=None, on_progress=None):
+    """덩어리별로 프로세스 풀에서 렌더링한 뒤 날짜 순서대로 합친다. on_progress(n) 은 n일을 끝낼 때마다 불림."""
+    chunks = chunk_daily_data(daily_data, chunk_by)
+    if len(chunks) <= 1 or RENDER_WORKERS <= 1:
+        result = create_full_pdf(daily_data, cal_legend_info, ordered_ids, font_scale, target, stats)
+        if on_progress: on_progress(len(daily_data))
+        return result
+
+    pool = _get_render_pool()
+    with tempfile.TemporaryDirectory(prefix='diary-chunks-') as tmp_dir:
+        paths = [os.path.join(tmp_dir, f"{i:04d}.pdf") for i in range(len(chunks))]
+        futures = [pool.submit(_render_chunk, chunk, cal_legend_info, ordered_ids, font_scale, path)
+                   for chunk, path in zip(chunks, paths)]
+        for chunk, f in zip(chunks, futures):
+            chunk_stats = f.result()
+            if stats is not None: merge_render_stats(stats, chunk_stats)
+            if on_progress: on_progress(len(chunk))
+        # paths 순서 = 날짜 순서
+        return merge_pdfs(paths, target)
+
+# --- [4. 월별 렌더링 캐시] ---
+RENDER_VERSION = "3"  # 템플릿을 바꾸면 올려서 예전 캐시를 무효화
+
+@functools.lru_cache(maxsize=8)
+def _css_digest(font_scale):
+    return hashlib.sha256(build_css(font_scale).encode()).hexdigest()
+
+def day_cache_key(target_date, data, cal_legend_info, ordered_ids, font_scale=FONT_SCALE):
+    """그날 페이지 모양을 결정하는 입력(일정, 범례 색상, 글자 크기, CSS)의 해시."""
+    used_cal_ids = {evt.calendar_id for evt in data['allday']} | {evt.calendar_id for evt in data['timed']}
+    payload = {
+        'version': RENDER_VERSION,
+        'css': _css_digest(font_scale),
+        'timeline': TIMELINE_BACKEND,
+        'expand': EXPAND_TIMELINE_LANES,
+        'date': target_date.isoformat(),
+        'legend': [[cal_id, cal_legend_info[cal_id]['name'], cal_legend_info[cal_id]['color']]
+                   for cal_id in ordered_ids if cal_id in used_cal_ids and cal_id in cal_legend_info],
+        'allday': [[evt.calendar_id, evt.summary, evt.description, evt.color] for evt in data['allday']],
+        'timed': [[evt.calendar_id, evt.calendar_name, evt.summary, evt.description, evt.color,
+                   evt.start.isoformat(), evt.end.isoformat()] for evt in data['timed']],
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode()).hexdigest()
+
+def month_cache_key(day_keys):
+    """한 달 덩어리의 캐시 키. 그 달에 든 날들의 day_cache_key 를 날짜 순으로 이어서 해시."""
+    return hashlib.sha256("".join(day_keys).encode()).hexdigest()
+
+def _render_chunk_to_cache(chunk, cal_legend_info, ordered_ids, font_scale, path):
+    # 같은 프로세스의 다른 작업(스레드)이 같은 달을 동시에 쓸 수 있으므로 임시 이름은 mkstemp 로
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        stats = _render_chunk(chunk, cal_legend_info, ordered_ids, font_scale, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return stats
+
+def render_months_cached(daily_data, cal_legend_info, ordered_ids, page_cache, font_scale=FONT_SCALE, stats=None, on_progress=None):
+    """월별 PDF [(그 달의 날짜 목록, 경로)] 를 날짜 순으로 돌려준다. 캐시에 없는 달만 새로 렌더링.
+
+    하루씩 따로 구운 PDF 는 저마다 폰트(NanumGothic) 서브셋을 따로 담고 pypdf 는 이를 합치지 못해서,
+    1년짜리 권이면 서브셋이 365개 들어감. 그래서 캐시 단위는 한 달이고, 키는 그 달 날짜별 키의 해시
+    (하루만 바뀌어도 그 달만 다시 구움).
+    """
+    months, missing = [], []
+    for chunk in chunk_daily_data(daily_data, 'month'):
+        days = sorted(chunk)
+        key = month_cache_key(day_cache_key(d, chunk[d], cal_legend_info, ordered_ids, font_scale) for d in days)
+        months.append((days, key))
+        if page_cache.get(key) is None: missing.append((chunk, key))
+    cached_days = sum(len(days) for days, _ in months) - sum(len(chunk) for chunk, _ in missing)
+    if on_progress and cached_days: on_progress(cached_days)
+
+    if missing:
+        if len(missing) > 1 and RENDER_WORKERS > 1:
+            pool = _get_render_pool()
+            futures = [pool.submit(_render_chunk_to_cache, chunk, cal_legend_info, ordered_ids, font_scale,
+                                   page_cache.path_for(key))
+                       for chunk, key in missing]
+            results = (f.result() for f in futures)
+        else:
+            results = (_render_chunk_to_cache(chunk, cal_legend_info, ordered_ids, font_scale, page_cache.path_for(key))
+                       for chunk, key in missing)
+        for (chunk, _), chunk_stats in zip(missing, results):
+            if stats is not None: merge_render_stats(stats, chunk_stats)
+            if on_progress: on_progress(len(chunk))
+        page_cache.evict(keep=[key for _, key in months])
+    if stats is not None: stats['cached_days'] += cached_days
+
+    return [(days, page_cache.path_for(key)) for days, key in months]
+
+# --- [5. 권 나누기 / 디스크 출력] ---
+VOLUME_SPLIT_DAYS = 100   # 이보다 긴 기간은 자동으로 여러 권으로 나눔
+QUARTER_SPLIT_DAYS = 366  # 1년이 넘으면 분기별, 아니면 월별
+
+def choose_volume_by(num_days):
+    if num_days <= VOLUME_SPLIT_DAYS: return None
+    return 'quarter' if num_days > QUARTER_SPLIT_DAYS else 'month'
+
+def volume_label(d, volume_by):
+    if volume_by == 'quarter': return f"{d.year}-Q{(d.month - 1) // 3 + 1}"
+    if volume_by == 'month': return f"{d.year}-{d.month:02d}"
+    return "all"
+
+def split_volumes(daily_data, volume_by=None):
+    """일정이 있는 날만 골라 [(라벨, 그 권의 daily_data)] 를 날짜 순으로 돌려준다."""
+    volumes = []
+    for d, events in sorted(daily_data.items()):
+        if not events['allday'] and not events['timed']: continue
+        label = volume_label(d, volume_by)
+        if not volumes or volumes[-1][0] != label:
+            volumes.append((label, {}))
+        volumes[-1][1][d] = events
+    return volumes
+
+def write_volumes(daily_data, cal_legend_info, ordered_ids, out_dir, font_scale=FONT_SCALE, volume_by=None, file_prefix="MyDiary", page_cache=None, report=None, on_progress=None, summary=False):
+    """권마다 PDF 를 out_dir 에 바로 쓴다. [{'label', 'path', 'days'}] 를 날짜 순으로 돌려줌.
+
+    summary=True 면 전체 기간의 요약 페이지(book_summary)를 첫 권 맨 앞에 넣음.
+
+    report(GenerationReport)를 넘기면 레이아웃/HTML/WeasyPrint/합치기 단계를 기록.
+    워커 프로세스에서 잰 시간은 워커별 합계로 들어감.
+    on_progress(n) 은 n일치 페이지를 다 구울 때마다 불림 (진행률 표시용).
+    """
+    t_start = time.perf_counter()
+    stats = new_render_stats()
+    merge_sec = 0.0
+    volumes = split_volumes(daily_data, volume_by)
+    results = []
+    for label, vol_data in volumes:
+        file_name = f"{file_prefix}.pdf" if volume_by is None else f"{file_prefix}_{label}.pdf"
+        results.append({'label': label, 'path': os.path.join(out_dir, file_name), 'days': len(vol_data)})
+
+    if page_cache is not None:
+        # 바뀐 달만 새로 굽고, 나머지는 캐시된 달을 그대로 이어붙임 (권은 항상 달 경계로 나뉨)
+        month_paths = render_months_cached(daily_data, cal_legend_info, ordered_ids, page_cache, font_scale, stats, on_progress)
+        t0 = time.perf_counter()
+        for (_, vol_data), vol in zip(volumes, results):
+            merge_pdfs([path for days, path in month_paths if days[0] in vol_data], target=vol['path'])
+        merge_sec = time.perf_counter() - t0
+    elif len(volumes) > 1 and RENDER_WORKERS > 1:
+        # 권끼리 동시에 굽기 (워커가 각자 파일로 씀)
+        pool = _get_render_pool()
+        futures = [pool.submit(_render_chunk, vol_data, cal_legend_info, ordered_ids, font_scale, vol['path'])
+                   for (_, vol_data), vol in zip(volumes, results)]
+        for vol, f in zip(results, futures):
+            merge_render_stats(stats, f.result())
+            if on_progress: on_progress(vol['days'])
+    else:
+        for (_, vol_data), vol in zip(volumes, results):
+            if len(vol_data) >= PARALLEL_MIN_DAYS:
+                create_full_pdf_parallel(vol_data, cal_legend_info, ordered_ids, font_scale, target=vol['path'], stats=stats, on_progress=on_progress)
+            else:
+                create_full_pdf(vol_data, cal_legend_info, ordered_ids, font_scale, target=vol['path'], stats=stats)
+                if on_progress: on_progress(len(vol_data))
+
+    summary_sec = 0.0
+    if summary and results:
+        t0 = time.perf_counter()
+        summary_pdf = create_summary_pdf(daily_data, cal_legend_info, ordered_ids, font_scale, stats)
+        first = results[0]['path']
+        merge_pdfs([summary_pdf, first], target=first + ".tmp")
+        os.replace(first + ".tmp", first)
+        summary_sec = time.perf_counter() - t0
+
+    if report:
+        report.add('layout', sec=stats['layout_sec'], events=stats['layout_events'])
+        report.add('html', sec=stats['html_sec'], bytes=stats['html_bytes'], days=stats['days'])
+        report.add('render', sec=stats['render_sec'], pages=stats['pages'],
+                   cached_days=stats['cached_days'], peak_rss_mb=max(stats['peak_rss_mb'], rss_mb()))
+        report.add('merge', sec=merge_sec, volumes=len(results))
+        if summary: report.add('summary', sec=summary_sec)
+        report.add('book', sec=time.perf_counter() - t_start)
+    return results
+
+def zip_volumes(volumes, zip_path):
+    # PDF 는 이미 압축돼 있으므로 ZIP_STORED 로 묶기만 함
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_STORED) as zf:
+        for vol in volumes:
+            zf.write(vol['path'], arcname=os.path.basename(vol['path']))
+    return zip_path
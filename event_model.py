@@ -0,0 +1,51 @@
+# ==========================================
+# [시온이네 일기장] 일정 모델
+# ==========================================
+# 1. 구글 API 응답 dict 를 그대로 들고 다니지 않고, 책에 쓰는 필드만 담은 읽기 전용 Event 로 바꿈
+#    -> etag/htmlLink/creator 같은 안 쓰는 필드를 버려서 1년치 책에서도 메모리가 작음
+# 2. 시간은 만들 때 한 번만 파싱 (시간 일정은 KST datetime, 종일 일정은 date)
+# 3. 여러 날에 걸친 일정은 같은 Event 를 날짜별 튜플이 나눠 가짐. 고칠 수 없으니 서로 덮어쓸 일이 없음
+# 4. 여러 캘린더에 공유된 같은 일정은 uid(iCalUID) + 시작 시각이 같음 -> 하나로 합치고 출처는 calendar_ids 에 남김
+
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+
+# all_day=True : start/end 는 date (end 는 API 표기대로 '다음날', 즉 포함하지 않음)
+# all_day=False: start/end 는 KST datetime
+# calendar_id/calendar_name/color 는 대표 캘린더 것, calendar_ids 는 이 일정이 들어 있던 캘린더 전부 (대표가 맨 앞)
+Event = namedtuple('Event', ['calendar_id', 'calendar_name', 'color', 'summary', 'description', 'all_day', 'start', 'end',
+                             'uid', 'calendar_ids'], defaults=('', ()))
+
+def _parse_datetime(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).astimezone(KST)
+
+def event_from_api(item, calendar_id, calendar_name, color):
+    """events().list 의 item 하나를 Event 로 바꾼다. 시작/종료 시간을 읽을 수 없으면 None."""
+    start = item.get('start', {})
+    end = item.get('end', {})
+    try:
+        if 'date' in start:
+            all_day = True
+            start_value, end_value = date.fromisoformat(start['date']), date.fromisoformat(end['date'])
+        elif 'dateTime' in start:
+            all_day = False
+            start_value, end_value = _parse_datetime(start['dateTime']), _parse_datetime(end['dateTime'])
+        else:
+            return None
+    except (KeyError, TypeError, ValueError):
+        return None
+    return Event(calendar_id, calendar_name, color, item.get('summary', ''), item.get('description', '') or '',
+                 all_day, start_value, end_value, item.get('iCalUID', ''), (calendar_id,))
+
+def duplicate_key(event):
+    """같은 일정의 사본끼리 같은 키 (반복 일정은 회차마다 시작 시각이 다름). iCalUID 가 없으면 None."""
+    return (event.uid, event.start) if event.uid else None
+
+def merge_copies(kept, other, rank, calendar_names):
+    """같은 일정의 두 사본을 하나로. rank(캘린더 ID) 가 작은 쪽의 색/이름이 대표가 된다."""
+    calendar_ids = tuple(sorted(set(kept.calendar_ids) | set(other.calendar_ids), key=rank))
+    winner = kept if rank(kept.calendar_id) <= rank(other.calendar_id) else other
+    return winner._replace(calendar_ids=calendar_ids,
+                           calendar_name=" · ".join(calendar_names.get(c, c) for c in calendar_ids))
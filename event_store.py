@@ -0,0 +1,174 @@
+# ==========================================
+# [시온이네 일기장] 로컬 일정 저장소 (SQLite + syncToken)
+# ==========================================
+# 1. 캘린더 ID별로 일정을 디스크(SQLite)에 보관
+# 2. 처음 한 번만 전체 범위를 내려받고, 이후에는 syncToken 으로 바뀐/삭제된 일정만 받음
+# 3. 요청 범위가 저장된 범위를 벗어나면 범위를 넓혀서 다시 전체 동기화
+#
+# 연결은 호출마다 새로 열기 때문에 여러 스레드/세션에서 같이 써도 안전함
+# 동기화도 가벼운 가져오기(EVENT_LIST_FIELDS)를 써서, 저장되는 본문도 책에 쓰는 필드만 남음
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+
+from calendar_fetch import EVENT_LIST_FIELDS, error_status, execute_with_backoff, lean_fields
+
+DEFAULT_STORE_PATH = os.environ.get(
+    'DIARY_STORE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'events.sqlite3')
+)
+SYNC_PAGE_SIZE = 2500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calendars (
+    cal_id      TEXT PRIMARY KEY,
+    sync_token  TEXT,
+    time_min    TEXT NOT NULL,
+    time_max    TEXT NOT NULL,
+    synced_at   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    cal_id      TEXT NOT NULL,
+    event_id    TEXT NOT NULL,
+    start_key   TEXT NOT NULL,
+    end_key     TEXT NOT NULL,
+    body        TEXT NOT NULL,
+    PRIMARY KEY (cal_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS events_range ON events (cal_id, start_key, end_key);
+"""
+
+def _utc_key(value):
+    # 'YYYY-MM-DD' / '...Z' / '...+09:00' / 시간대 없는 값 → 비교 가능한 UTC 문자열
+    if len(value) == 10:
+        return value + 'T00:00:00'
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.strftime('%Y-%m-%dT%H:%M:%S')
+
+def _event_keys(event):
+    start = event.get('start', {})
+    end = event.get('end', {})
+    start_raw = start.get('dateTime') or start.get('date')
+    end_raw = end.get('dateTime') or end.get('date') or start_raw
+    return _utc_key(start_raw), _utc_key(end_raw)
+
+def _is_gone(error):
+    # HttpError 410: syncToken 만료 → 전체 동기화 필요
+    return error_status(error) == 410
+
+class EventStore:
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _get_state(self, conn, cal_id):
+        return conn.execute(
+            "SELECT sync_token, time_min, time_max FROM calendars WHERE cal_id = ?", (cal_id,)
+        ).fetchone()
+
+    def sync(self, service, cal_id, time_min, time_max, http=None):
+        """cal_id 를 [time_min, time_max] 범위까지 최신 상태로 맞춘다. 받은 페이지 수를 돌려준다."""
+        key_min, key_max = _utc_key(time_min), _utc_key(time_max)
+        with closing(self._connect()) as conn:
+            state = self._get_state(conn, cal_id)
+            if state:
+                sync_token, old_min, old_max = state
+                if sync_token and old_min <= key_min and key_max <= old_max:
+                    try:
+                        return self._incremental_sync(conn, service, cal_id, sync_token, http)
+                    except Exception as e:
+                        if not _is_gone(e): raise
+                # 기존 범위까지 포함하도록 넓혀서 다시 받음
+                key_min, key_max = min(key_min, old_min), max(key_max, old_max)
+            return self._full_sync(conn, service, cal_id, key_min, key_max, http)
+
+    def _fetch_pages(self, service, http, **params):
+        # 네트워크로 모든 페이지를 먼저 받아 둔다 (그동안 DB 쓰기 잠금을 잡지 않아야 다른 캘린더 동기화가 안 막힘)
+        items, pages, page_token = [], 0, None
+        while True:
+            result = execute_with_backoff(service.events().list(
+                maxResults=SYNC_PAGE_SIZE, singleEvents=True, pageToken=page_token,
+                **params, **lean_fields(EVENT_LIST_FIELDS)
+            ), http=http)
+            pages += 1
+            items.extend(result.get('items', []))
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                return items, pages, result.get('nextSyncToken')
+
+    def _full_sync(self, conn, service, cal_id, key_min, key_max, http):
+        items, pages, sync_token = self._fetch_pages(
+            service, http, calendarId=cal_id, timeMin=key_min + 'Z', timeMax=key_max + 'Z'
+        )
+        # 다 받은 뒤에 지우기 + 넣기를 짧은 트랜잭션 하나로
+        with conn:
+            conn.execute("DELETE FROM events WHERE cal_id = ?", (cal_id,))
+            self._apply_items(conn, cal_id, items)
+            self._save_state(conn, cal_id, sync_token, key_min, key_max)
+        return pages
+
+    def _incremental_sync(self, conn, service, cal_id, sync_token, http):
+        items, pages, next_token = self._fetch_pages(service, http, calendarId=cal_id, syncToken=sync_token)
+        with conn:
+            self._apply_items(conn, cal_id, items)
+            conn.execute(
+                "UPDATE calendars SET sync_token = ?, synced_at = ? WHERE cal_id = ?",
+                (next_token or sync_token, datetime.now(timezone.utc).isoformat(), cal_id)
+            )
+        return pages
+
+    def _apply_items(self, conn, cal_id, items):
+        deleted, rows = [], []
+        for event in items:
+            if event.get('status') == 'cancelled':
+                deleted.append((cal_id, event['id']))
+                continue
+            try:
+                start_key, end_key = _event_keys(event)
+            except Exception:
+                continue
+            rows.append((cal_id, event['id'], start_key, end_key, json.dumps(event, ensure_ascii=False)))
+        if deleted:
+            conn.executemany("DELETE FROM events WHERE cal_id = ? AND event_id = ?", deleted)
+        if rows:
+            conn.executemany("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _save_state(self, conn, cal_id, sync_token, key_min, key_max):
+        conn.execute(
+            "INSERT OR REPLACE INTO calendars VALUES (?, ?, ?, ?, ?)",
+            (cal_id, sync_token, key_min, key_max, datetime.now(timezone.utc).isoformat())
+        )
+
+    def iter_events(self, cal_id, time_min, time_max, batch_size=SYNC_PAGE_SIZE):
+        """저장된 일정 중 범위에 걸치는 것을 시작 시간 순으로, batch_size 개씩 묶어서 내보낸다."""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "SELECT body FROM events WHERE cal_id = ? AND start_key < ? AND end_key > ? ORDER BY start_key",
+                (cal_id, _utc_key(time_max), _utc_key(time_min))
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows: break
+                yield [json.loads(body) for (body,) in rows]
+
+    def clear(self, cal_id=None):
+        with closing(self._connect()) as conn, conn:
+            if cal_id is None:
+                conn.execute("DELETE FROM events")
+                conn.execute("DELETE FROM calendars")
+            else:
+                conn.execute("DELETE FROM events WHERE cal_id = ?", (cal_id,))
+                conn.execute("DELETE FROM calendars WHERE cal_id = ?", (cal_id,))
@@ -0,0 +1,337 @@
+# ==========================================
+# [시온이네 일기장] 가벼운 내보내기 (HTML 묶음 / EPUB)
+# ==========================================
+# 1. 인쇄용이 아니라 훑어보기/검색용: WeasyPrint 없이 generate_day_html 결과를 그대로 파일로 씀
+#    -> 몇 년치도 몇 초. PDF 는 실제로 인쇄할 기간만 굽기
+# 2. 하루에 파일 하나, 하루씩 바로 디스크(EPUB 은 ZIP 안)에 씀 -> 기간이 길어도 메모리가 일정함
+# 3. 스타일시트(style.css)는 하나를 모든 날이 같이 씀
+# 4. HTML 묶음 목차: index.html(연도 목록 + 제목 검색) → index-YYYY.html(월별 날짜 목록 + 옆 창)
+#    날짜 파일은 목차에서 누를 때만 옆 창에 불러오고, 검색용 목록(search-index.js)도 검색창을 누를 때 불러옴
+# 5. EPUB 3: 날짜마다 XHTML 한 장, 목차(nav.xhtml)는 연 → 월 → 날짜
+
+import html
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+
+from diary_render import FONT_SCALE, WEEKDAY_KR, browser_css, build_css, write_day_html
+
+EXPORT_FORMATS = ('html', 'epub')
+BOOK_TITLE = "시온이네 일기장"
+PROGRESS_EVERY_DAYS = 20  # on_progress 를 이만큼 모아서 부름
+
+_EXPORT_CSS = """
+        .day-nav { display: flex; justify-content: space-between; font-size: 10pt; margin: 8px 0 12px 0; }
+        .day-nav a { color: #5d4037; text-decoration: none; }
+        .book-index { font-family: 'NanumGothic', sans-serif; color: #333; }
+        .book-index a { color: #3e2723; }
+        .year-layout { display: grid; grid-template-columns: 260px 1fr; height: 100vh; margin: 0; }
+        .year-toc { overflow-y: auto; padding: 10px; border-right: 1px solid #ddd; font-size: 9pt; }
+        .year-toc h3 { margin: 12px 0 4px 0; color: #5d4037; }
+        .year-toc li { margin-bottom: 3px; }
+        .year-toc .titles { color: #888; font-size: 8pt; }
+        .year-layout iframe { width: 100%; height: 100%; border: 0; }
+"""
+
+def _non_empty_days(daily_data):
+    return [d for d, v in sorted(daily_data.items()) if v['allday'] or v['timed']]
+
+def _day_titles(data):
+    return " · ".join(evt.summary for evt in (*data['allday'], *data['timed']) if evt.summary)
+
+def _day_label(d):
+    return f"{d.isoformat()} ({WEEKDAY_KR[d.weekday()]})"
+
+def _export_stats(report, name, t_start, days, bytes_written):
+    if report: report.add(name, sec=time.perf_counter() - t_start, days=days, bytes=bytes_written)
+
+# --- [1. HTML 묶음] ---
+_DAY_PAGE = """<!DOCTYPE html>
+<html lang='ko'><head><meta charset='utf-8'><title>{label}</title><link rel='stylesheet' href='../../style.css'></head>
+<body><nav class='day-nav'>{prev}<a href='../../index-{year}.html' target='_top'>📅 {year}년 목차</a>{next}</nav>
+{body}</body></html>""".format
+
+_INDEX_PAGE = """<!DOCTYPE html>
+<html lang='ko'><head><meta charset='utf-8'><title>{title}</title><link rel='stylesheet' href='style.css'></head>
+<body class='book-index'><h1>📖 {title}</h1><p>{period} · {days}일</p>
+<p><input id='q' type='search' placeholder='🔎 일정 제목 검색' style='width: 100%; padding: 6px;'></p>
+<ul id='results'></ul>
+<h2>연도별 목차</h2><ul>{years}</ul>
+<script>
+const q = document.getElementById('q'), results = document.getElementById('results');
+q.addEventListener('focus', () => {{
+  if (window.DIARY_INDEX || document.getElementById('search-index')) return;
+  const s = document.createElement('script'); s.id = 'search-index'; s.src = 'search-index.js'; document.head.appendChild(s);
+}});
+q.addEventListener('input', () => {{
+  const word = q.value.trim().toLowerCase(); results.innerHTML = '';
+  if (!word || !window.DIARY_INDEX) return;
+  for (const [day, year, titles] of window.DIARY_INDEX.filter(e => e[2].toLowerCase().includes(word)).slice(0, 200)) {{
+    const li = document.createElement('li'), a = document.createElement('a');
+    a.href = `days/${{year}}/${{day}}.html`; a.textContent = day; li.append(a, ' ' + titles); results.append(li);
+  }}
+}});
+</script></body></html>"""
+
+_YEAR_PAGE = """<!DOCTYPE html>
+<html lang='ko'><head><meta charset='utf-8'><title>{title} {year}년</title><link rel='stylesheet' href='style.css'></head>
+<body class='book-index year-layout'><div class='year-toc'><a href='index.html'>← 전체 목차</a>{months}</div>
+<iframe name='day' src='{first}' loading='lazy'></iframe></body></html>"""
+
+def _write_year_page(out_dir, title, year, entries):
+    months = []
+    current = None
+    for d, titles in entries:
+        if d.month != current:
+            if current is not None: months.append("</ul>")
+            current = d.month
+            months.append(f"<h3>{d.month}월</h3><ul>")
+        months.append(f"<li><a href='days/{year}/{d.isoformat()}.html' target='day'>{_day_label(d)}</a>"
+                      f"<div class='titles'>{html.escape(titles)}</div></li>")
+    months.append("</ul>")
+    page = _YEAR_PAGE.format(title=html.escape(title), year=year, months="".join(months),
+                             first=f"days/{year}/{entries[0][0].isoformat()}.html")
+    with open(os.path.join(out_dir, f"index-{year}.html"), 'w', encoding='utf-8') as f:
+        f.write(page)
+
+def export_html_bundle(daily_data, cal_legend_info, ordered_ids, out_dir, font_scale=FONT_SCALE,
+                       title=BOOK_TITLE, report=None, on_progress=None):
+    """날짜별 HTML 파일 + 목차 + 스타일시트 하나를 out_dir 에 쓴다. 쓴 날 수를 돌려줌."""
+    t_start = time.perf_counter()
+    days = _non_empty_days(daily_data)
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "style.css"), 'w', encoding='utf-8') as f:
+        f.write(browser_css(font_scale) + _EXPORT_CSS)
+
+    bytes_written = 0
+    years = []          # (연도, 날 수)
+    year_entries = []   # 지금 쓰는 연도의 (날짜, 제목들) - 연도가 바뀌면 목차를 쓰고 비움
+    pending = 0
+    with open(os.path.join(out_dir, "search-index.js"), 'w', encoding='utf-8') as search:
+        search.write("window.DIARY_INDEX = [\n")
+        for i, d in enumerate(days):
+            if year_entries and year_entries[-1][0].year != d.year:
+                _write_year_page(out_dir, title, year_entries[-1][0].year, year_entries)
+                years.append((year_entries[-1][0].year, len(year_entries)))
+                year_entries = []
+            prev_link = (f"<a href='../{days[i - 1].year}/{days[i - 1].isoformat()}.html'>← {days[i - 1].isoformat()}</a>"
+                         if i > 0 else "<span></span>")
+            next_link = (f"<a href='../{days[i + 1].year}/{days[i + 1].isoformat()}.html'>{days[i + 1].isoformat()} →</a>"
+                         if i + 1 < len(days) else "<span></span>")
+            out = []
+            write_day_html(out, d, daily_data[d], cal_legend_info, ordered_ids, font_scale)
+            page = _DAY_PAGE(label=_day_label(d), prev=prev_link, next=next_link, year=d.year, body="".join(out))
+            day_dir = os.path.join(out_dir, "days", str(d.year))
+            os.makedirs(day_dir, exist_ok=True)
+            with open(os.path.join(day_dir, f"{d.isoformat()}.html"), 'w', encoding='utf-8') as f:
+                f.write(page)
+            bytes_written += len(page.encode())
+
+            titles = _day_titles(daily_data[d])
+            search.write(json.dumps([d.isoformat(), d.year, titles], ensure_ascii=False) + ",\n")
+            year_entries.append((d, titles))
+            pending += 1
+            if on_progress and pending >= PROGRESS_EVERY_DAYS:
+                on_progress(pending)
+                pending = 0
+        search.write("];\n")
+    if year_entries:
+        _write_year_page(out_dir, title, year_entries[-1][0].year, year_entries)
+        years.append((year_entries[-1][0].year, len(year_entries)))
+    if on_progress and pending: on_progress(pending)
+
+    period = f"{days[0].isoformat()} ~ {days[-1].isoformat()}" if days else ""
+    year_items = "".join(f"<li><a href='index-{year}.html'>{year}년</a> ({count}일)</li>" for year, count in years)
+    with open(os.path.join(out_dir, "index.html"), 'w', encoding='utf-8') as f:
+        f.write(_INDEX_PAGE.format(title=html.escape(title), period=period, days=len(days), years=year_items))
+    _export_stats(report, 'export', t_start, len(days), bytes_written)
+    return len(days)
+
+def zip_bundle(bundle_dir, zip_path):
+    # 내려받기용. HTML 은 잘 줄어들므로 압축해서 묶음
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for root, _, files in os.walk(bundle_dir):
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                zf.write(path, arcname=os.path.relpath(path, os.path.dirname(bundle_dir)))
+    return zip_path
+
+# --- [2. EPUB] ---
+# EPUB 은 XHTML 이어야 하므로 generate_day_html 결과(메모 안의 HTML 포함)를 닫는 태그가 맞는 XML 로 다시 씀
+_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+_NAME_RE = re.compile(r'^[A-Za-z_][-\w.]*$')
+_SVG_NS = "http://www.w3.org/2000/svg"
+
+class _XHTMLWriter(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.stack = []
+
+    def _open(self, tag, attrs, self_closing):
+        if not _NAME_RE.match(tag): return
+        attrs = [(k, v) for k, v in attrs if _NAME_RE.match(k)]
+        if tag == 'svg' and not any(k == 'xmlns' for k, _ in attrs): attrs.append(('xmlns', _SVG_NS))
+        attr = "".join(f' {k}="{html.escape(k if v is None else v)}"' for k, v in attrs)
+        if self_closing or tag in _VOID_TAGS:
+            self.out.append(f"<{tag}{attr}/>")
+        else:
+            self.out.append(f"<{tag}{attr}>")
+            self.stack.append(tag)
+
+    def handle_starttag(self, tag, attrs):
+        self._open(tag, attrs, False)
+
+    def handle_startendtag(self, tag, attrs):
+        self._open(tag, attrs, True)
+
+    def handle_endtag(self, tag):
+        # 안 닫힌 태그는 여기서 같이 닫고, 열린 적 없는 닫는 태그는 버림
+        if tag not in self.stack: return
+        while self.stack:
+            open_tag = self.stack.pop()
+            self.out.append(f"</{open_tag}>")
+            if open_tag == tag: break
+
+    def handle_data(self, data):
+        self.out.append(html.escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        while self.stack: self.out.append(f"</{self.stack.pop()}>")
+        return "".join(self.out)
+
+def to_xhtml(fragment):
+    writer = _XHTMLWriter()
+    writer.feed(fragment)
+    return writer.result()
+
+_VOID_TAG_RE = re.compile(r"<(br|wbr)>")
+
+def _day_xhtml(data, cal_legend_info, day_html):
+    # 템플릿이 만든 부분은 빈 태그(<br>/<wbr>)와 svg 네임스페이스만 고치면 XML 이 됨
+    # 일정 제목/메모/캘린더 이름에 태그나 &가 있는 날만 느린 파서로 다시 씀
+    texts = [cal_legend_info[cal_id]['name'] for cal_id in cal_legend_info]
+    texts.extend(evt.summary + evt.description + evt.calendar_name for evt in (*data['allday'], *data['timed']))
+    if any('<' in text or '&' in text for text in texts):
+        return to_xhtml(day_html)
+    return _VOID_TAG_RE.sub(r"<\1/>", day_html).replace("<svg ", f"<svg xmlns='{_SVG_NS}' ")
+
+_XHTML_PAGE = """<?xml version="1.0" encoding="utf-8"?>
+<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="ko" xml:lang="ko">
+<head><meta charset="utf-8"/><title>{title}</title><link rel="stylesheet" type="text/css" href="{css}"/></head>
+<body>{body}</body></html>""".format
+
+_CONTAINER_XML = """<?xml version="1.0" encoding="utf-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+<rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>
+</container>"""
+
+_CONTENT_OPF = """<?xml version="1.0" encoding="utf-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id" xml:lang="ko">
+<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+<dc:identifier id="book-id">urn:uuid:{book_id}</dc:identifier><dc:title>{title}</dc:title><dc:language>ko</dc:language>
+<meta property="dcterms:modified">{modified}</meta>
+</metadata>
+<manifest>
+<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>
+<item id="css" href="style.css" media-type="text/css"/>
+{items}
+</manifest>
+<spine>{itemrefs}</spine>
+</package>"""
+
+# 전자책 뷰어는 화면 폭이 제각각이라 미리보기처럼 폭을 고정하지 않음
+_EPUB_CSS = """
+        .date-header-running { display: none; }
+        .day-container { page-break-after: always; }
+"""
+
+def _nav_xhtml(title, entries):
+    # 연 → 월 → 날짜 목차 (entries: (날짜, 파일 이름))
+    # 이미 이스케이프한 값만 넣은 XHTML 이라 to_xhtml 을 거치지 않음 (거치면 epub:type 이 빠짐)
+    out = [f"<nav epub:type='toc' id='toc'><h1>{html.escape(title)}</h1><ol>"]
+    year = month = None
+    for d, href in entries:
+        if d.year != year:
+            if year is not None: out.append("</ol></li></ol></li>")
+            year, month = d.year, None
+            out.append(f"<li><a href='{href}'>{d.year}년</a><ol>")
+        if d.month != month:
+            if month is not None: out.append("</ol></li>")
+            month = d.month
+            out.append(f"<li><a href='{href}'>{d.month}월</a><ol>")
+        out.append(f"<li><a href='{href}'>{_day_label(d)}</a></li>")
+    if year is not None: out.append("</ol></li></ol></li>")
+    out.append("</ol></nav>")
+    return _XHTML_PAGE(title=html.escape(title), css="style.css", body="".join(out))
+
+def export_epub(daily_data, cal_legend_info, ordered_ids, path, font_scale=FONT_SCALE,
+                title=BOOK_TITLE, report=None, on_progress=None):
+    """날짜마다 XHTML 한 장인 EPUB 3 파일을 path 에 쓴다. 쓴 날 수를 돌려줌."""
+    t_start = time.perf_counter()
+    days = _non_empty_days(daily_data)
+    if days: title = f"{title} ({days[0].isoformat()} ~ {days[-1].isoformat()})"
+    entries = []   # (날짜, 파일 이름)
+    items, itemrefs = [], []
+    bytes_written = 0
+    pending = 0
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        # mimetype 은 압축하지 않고 맨 앞에 (EPUB 규칙)
+        zf.writestr(zipfile.ZipInfo("mimetype"), "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        zf.writestr("META-INF/container.xml", _CONTAINER_XML)
+        zf.writestr("OEBPS/style.css", build_css(font_scale) + _EPUB_CSS)
+        for d in days:
+            out = []
+            write_day_html(out, d, daily_data[d], cal_legend_info, ordered_ids, font_scale)
+            body = _day_xhtml(daily_data[d], cal_legend_info, "".join(out))
+            href = f"days/{d.isoformat()}.xhtml"
+            page = _XHTML_PAGE(title=_day_label(d), css="../style.css", body=body)
+            zf.writestr(f"OEBPS/{href}", page)
+            bytes_written += len(page.encode())
+
+            item_id = f"d{d.strftime('%Y%m%d')}"
+            properties = " properties='svg'" if "<svg" in body else ""
+            items.append(f"<item id='{item_id}' href='{href}' media-type='application/xhtml+xml'{properties}/>")
+            itemrefs.append(f"<itemref idref='{item_id}'/>")
+            entries.append((d, href))
+            pending += 1
+            if on_progress and pending >= PROGRESS_EVERY_DAYS:
+                on_progress(pending)
+                pending = 0
+
+        zf.writestr("OEBPS/nav.xhtml", _nav_xhtml(title, entries))
+        zf.writestr("OEBPS/content.opf", _CONTENT_OPF.format(
+            book_id=uuid.uuid5(uuid.NAMESPACE_URL, f"diary:{title}"), title=html.escape(title),
+            modified=datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            items="\n".join(items), itemrefs="".join(itemrefs),
+        ))
+    if on_progress and pending: on_progress(pending)
+    _export_stats(report, 'export', t_start, len(days), bytes_written)
+    return len(days)
+
+# --- [3. 진입점] ---
+def export_book(fmt, daily_data, cal_legend_info, ordered_ids, out_dir, font_scale=FONT_SCALE,
+                file_prefix="MyDiary", report=None, on_progress=None):
+    """write_volumes 처럼 [{'label', 'path', 'days'}] 를 돌려준다 (HTML 은 묶음 폴더를 ZIP 으로 묶은 파일).
+
+    HTML 묶음 폴더 자체는 out_dir/<file_prefix>_html/ 에 남음.
+    """
+    if fmt == 'epub':
+        path = os.path.join(out_dir, f"{file_prefix}.epub")
+        days = export_epub(daily_data, cal_legend_info, ordered_ids, path, font_scale, report=report, on_progress=on_progress)
+        return [{'label': "EPUB", 'path': path, 'days': days}]
+    if fmt == 'html':
+        bundle_dir = os.path.join(out_dir, f"{file_prefix}_html")
+        shutil.rmtree(bundle_dir, ignore_errors=True)
+        days = export_html_bundle(daily_data, cal_legend_info, ordered_ids, bundle_dir, font_scale,
+                                  report=report, on_progress=on_progress)
+        return [{'label': "HTML", 'path': zip_bundle(bundle_dir, bundle_dir + ".zip"), 'days': days}]
+    raise ValueError(f"지원하지 않는 형식: {fmt!r} (가능: {', '.join(EXPORT_FORMATS)})")
@@ -0,0 +1,109 @@
+# ==========================================
+# [시온이네 일기장] 단계별 계측 (책 한 권 만들 때)
+# ==========================================
+# 1. 캘린더별 API 시간/페이지 수, 그룹핑·레이아웃 시간과 일정 수, HTML 크기,
+#    WeasyPrint 렌더링 시간과 최대 메모리(RSS)를 한 곳에 모음
+# 2. 화면(처리 결과 로그)에 보여줄 요약과, 모니터링용 JSON 로그 한 줄씩을 만들어 줌
+#
+# 워커 스레드에서 같이 쓰므로 기록은 락으로 보호함
+
+import json
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+
+logger = logging.getLogger("diary.report")
+
+def enable_report_logging(stream=None):
+    """diary.report 의 JSON 줄을 stream(기본 stderr)으로 내보낸다. 여러 번 불러도 핸들러는 하나.
+
+    루트 로거는 기본이 WARNING 이라, 로깅 설정이 없는 곳(Streamlit 앱)에서는 INFO 줄이 버려짐.
+    """
+    if not any(getattr(h, '_diary_report', False) for h in logger.handlers):
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handler._diary_report = True
+        logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False  # 루트에도 핸들러가 있으면 두 번 찍히지 않도록
+
+def peak_rss_mb():
+    # 지금까지 이 프로세스가 쓴 최대 메모리 (리눅스는 KB, 맥은 byte 단위)
+    # 프로세스가 끝날 때까지 줄지 않으므로 벤치마크처럼 한 번 돌고 끝나는 곳에서만 씀
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def rss_mb():
+    """지금 이 프로세스의 메모리(RSS, MB).
+
+    Streamlit 서버나 렌더링 워커처럼 오래 사는 프로세스에서는 ru_maxrss 가 첫 큰 책의 값에 머물러서
+    책마다의 메모리를 알 수 없음. 그래서 책을 만드는 동안 여러 번 재서 그중 최댓값을 그 책의 값으로 씀.
+    /proc 이 없는 곳(맥)에서는 peak_rss_mb 로 대신함.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+    return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+class GenerationReport:
+    def __init__(self):
+        self.started_at = time.time()
+        self.stages = {}      # 단계 이름 → {'sec': ..., 그 밖의 숫자들}
+        self.calendars = {}   # cal_id → {'sec', 'pages', 'events', 'error'}
+        self._lock = threading.Lock()
+
+    def add(self, name, **fields):
+        with self._lock:
+            self.stages.setdefault(name, {}).update(fields)
+
+    def calendar(self, cal_id, **fields):
+        with self._lock:
+            self.calendars.setdefault(cal_id, {}).update(fields)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'total_sec': time.time() - self.started_at,
+                'stages': {name: dict(entry) for name, entry in self.stages.items()},
+                'calendars': {cal_id: dict(entry) for cal_id, entry in self.calendars.items()},
+            }
+
+    def summary_lines(self):
+        """화면에 보여줄 한 줄 요약들."""
+        data = self.to_dict()
+        lines = []
+        for cal_id, c in data['calendars'].items():
+            state = "실패" if c.get('error') else f"{c.get('pages', 0)}페이지 / {c.get('events', 0)}개"
+            lines.append(f"📡 [{c.get('name', cal_id)}] {c.get('sec', 0):.2f}초 ({state})")
+        labels = {
+            'calendar_info': "캘린더 정보", 'fetch': "가져오기", 'group': "날짜별 정리",
+            'layout': "타임라인 배치", 'html': "HTML 만들기", 'render': "PDF 굽기(WeasyPrint)", 'merge': "PDF 합치기", 'summary': "요약 페이지", 'export': "HTML/EPUB 내보내기",
+            'book': "책 만들기 전체",
+        }
+        for name, s in data['stages'].items():
+            extra = []
+            if 'events' in s: extra.append(f"일정 {s['events']}개")
+            if 'days' in s: extra.append(f"{s['days']}일")
+            if s.get('duplicates'): extra.append(f"중복 {s['duplicates']}개 합침")
+            if 'bytes' in s: extra.append(f"{s['bytes'] / (1024 * 1024):.1f}MB")
+            if 'pages' in s: extra.append(f"{s['pages']}쪽")
+            if 'cached_days' in s: extra.append(f"캐시 {s['cached_days']}일")
+            if 'peak_rss_mb' in s: extra.append(f"최대 메모리 {s['peak_rss_mb']:.0f}MB")
+            lines.append(f"⏱️ {labels.get(name, name)}: {s.get('sec', 0):.2f}초" + (f" ({', '.join(extra)})" if extra else ""))
+        lines.append(f"⏱️ 전체: {data['total_sec']:.2f}초")
+        return lines
+
+    def log(self, **context):
+        # 모니터링용: 단계/캘린더마다 JSON 한 줄 (context 는 모든 줄에 붙음, 예: job='sion')
+        data = self.to_dict()
+        for name, entry in data['stages'].items():
+            logger.info(json.dumps({**context, 'type': 'stage', 'stage': name, **entry}, ensure_ascii=False))
+        for cal_id, entry in data['calendars'].items():
+            logger.info(json.dumps({**context, 'type': 'calendar', 'calendar_id': cal_id, **entry}, ensure_ascii=False))
+        logger.info(json.dumps({**context, 'type': 'total', 'sec': data['total_sec']}, ensure_ascii=False))
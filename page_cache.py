@@ -0,0 +1,65 @@
+# ==========================================
+# [시온이네 일기장] 월별 렌더링 결과 캐시 (디스크, LRU)
+# ==========================================
+# 1. 한 달치 PDF 를 내용 해시(키) 이름의 파일로 보관 (diary_render.render_months_cached)
+# 2. 꺼내 쓸 때마다 수정 시간을 갱신하고, 용량을 넘으면 오래 안 쓴 파일부터 지움
+#
+# 파일은 임시 이름으로 쓴 뒤 os.replace 로 바꿔치기하므로 여러 프로세스가 같이 써도 안전함
+
+import os
+
+DEFAULT_PAGE_CACHE_DIR = os.environ.get(
+    'DIARY_PAGE_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'pages')
+)
+DEFAULT_PAGE_CACHE_BYTES = 512 * 1024 * 1024
+
+class PageCache:
+    def __init__(self, cache_dir=DEFAULT_PAGE_CACHE_DIR, max_bytes=DEFAULT_PAGE_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def get(self, key):
+        """있으면 파일 경로를 돌려주고 최근 사용 시간을 갱신. 없으면 None."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def evict(self, keep=()):
+        """전체 용량이 max_bytes 를 넘으면 오래 안 쓴 파일부터 지운다. keep 에 든 키는 남겨둠."""
+        keep_paths = {self.path_for(key) for key in keep}
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.pdf'): continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            total += stat.st_size
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        if total <= self.max_bytes: return 0
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes: break
+            if path in keep_paths: continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.pdf'):
+                os.remove(entry.path)
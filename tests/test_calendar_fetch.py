@@ -0,0 +1,48 @@
+# ==========================================
+# [테스트] 캘린더 가져오기 (calendar_fetch)
+# ==========================================
+# 캘린더 하나가 중간 페이지에서 실패해도, 먼저 받은 일정이 책에 들어갔다는 것이 로그에 드러나야 한다.
+
+import os
+import sys
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import calendar_fetch
+from calendar_fetch import get_events_from_ids
+from fake_calendar import FakeCalendarService
+
+class _FailingEvents:
+    # fail_cal 의 두 번째 페이지부터 오류
+    def __init__(self, inner, fail_cal):
+        self.inner = inner
+        self.fail_cal = fail_cal
+
+    def list(self, calendarId, pageToken=None, **kwargs):
+        request = self.inner.list(calendarId=calendarId, pageToken=pageToken, **kwargs)
+        if calendarId == self.fail_cal and pageToken:
+            def fail(**kw):
+                raise RuntimeError("page failed")
+            request.execute = fail
+        return request
+
+class FailingCalendarService(FakeCalendarService):
+    def __init__(self, fail_cal, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_cal = fail_cal
+
+    def events(self):
+        return _FailingEvents(super().events(), self.fail_cal)
+
+def test_partial_calendar_failure_is_reported(monkeypatch):
+    monkeypatch.setattr(calendar_fetch, 'PAGE_SIZE', 5)
+    service = FailingCalendarService('b@x', events_per_day=2)
+    daily_data, _, logs = get_events_from_ids(service, ['a@x', 'b@x'], {}, date(2026, 3, 1), date(2026, 3, 7))
+    included = sum(1 for v in daily_data.values() for e in v['timed'] + v['allday'] if e.calendar_id == 'b@x')
+    assert included > 0
+    assert any(log.startswith("❌ [b@x]") for log in logs)
+    assert any(log.startswith("⚠️") and "먼저 받은 5개만" in log for log in logs)
+    assert any(log.startswith("✅") for log in logs)
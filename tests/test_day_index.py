@@ -0,0 +1,97 @@
+# ==========================================
+# [테스트] 날짜별 그룹핑이 가져오기 순서와 상관없이 같은지
+# ==========================================
+# 캘린더 페이지가 어떤 순서로 섞여 도착해도 (워커 1개 / 여러 개, 느린 캘린더가 바뀌어도)
+# 같은 daily_data 와 같은 day_cache_key 가 나와야 페이지 캐시가 맞는다.
+
+import os
+import random
+import sys
+import time
+from datetime import date
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import calendar_fetch
+from calendar_fetch import DayIndex, get_events_from_ids
+from diary_render import day_cache_key
+from event_model import event_from_api
+from fake_calendar import FakeCalendarService
+
+CAL_IDS = ['mom@x', 'dad@x', 'kid@x']
+START, END = date(2026, 3, 1), date(2026, 3, 14)
+
+class _SlowEvents:
+    # 정해진 캘린더의 events().list 만 늦게 응답
+    def __init__(self, inner, delays):
+        self.inner = inner
+        self.delays = delays
+
+    def list(self, calendarId, **kwargs):
+        request = self.inner.list(calendarId=calendarId, **kwargs)
+        execute = request.execute
+        delay = self.delays.get(calendarId, 0)
+        def slow_execute(**kw):
+            time.sleep(delay)
+            return execute(**kw)
+        request.execute = slow_execute
+        return request
+
+class SlowCalendarService(FakeCalendarService):
+    def __init__(self, delays, **kwargs):
+        super().__init__(**kwargs)
+        self.delays = delays
+
+    def events(self):
+        return _SlowEvents(super().events(), self.delays)
+
+def _fetch(monkeypatch, workers, delays, dedupe):
+    # 매일 종일 일정 + 모든 캘린더에 같은 시각의 공유 일정 → 캘린더끼리 순서가 겹치는 경우가 매일 생김
+    service = SlowCalendarService(delays, events_per_day=2, allday_per_week=7, shared_per_day=2)
+    monkeypatch.setattr(calendar_fetch, 'MAX_FETCH_WORKERS', workers)
+    monkeypatch.setattr(calendar_fetch, 'PAGE_SIZE', 5)  # 캘린더마다 여러 페이지가 섞여 도착하도록
+    daily_data, legend, _ = get_events_from_ids(service, CAL_IDS, {}, START, END, dedupe=dedupe)
+    return daily_data, legend
+
+@pytest.mark.parametrize('dedupe', [False, True])
+def test_workers_and_arrival_order_do_not_change_result(monkeypatch, dedupe):
+    expected, legend = _fetch(monkeypatch, 1, {}, dedupe)
+    for slow in CAL_IDS:
+        got, _ = _fetch(monkeypatch, len(CAL_IDS), {slow: 0.02}, dedupe)
+        assert got == expected
+        for day, data in got.items():
+            assert day_cache_key(day, data, legend, CAL_IDS) == day_cache_key(day, expected[day], legend, CAL_IDS)
+
+def test_ties_follow_calendar_order_then_stream_order():
+    service = FakeCalendarService(events_per_day=0, allday_per_week=7, shared_per_day=2)
+    time_min, time_max = '2026-02-28T00:00:00Z', '2026-03-16T00:00:00Z'
+    streams = {cal_id: [event_from_api(item, cal_id, cal_id, '#7986cb')
+                        for item in service.window_events(cal_id, time_min, time_max)]
+               for cal_id in CAL_IDS}
+
+    def build(interleaved):
+        day_index = DayIndex(START, END, calendar_order=CAL_IDS)
+        for event in interleaved: day_index.add(event)
+        return day_index.build()
+
+    in_order = build([event for cal_id in CAL_IDS for event in streams[cal_id]])
+    rng = random.Random(0)
+    for _ in range(5):
+        # 캘린더 안 순서는 지키면서 캘린더끼리 무작위로 섞음
+        queues = {cal_id: list(events) for cal_id, events in streams.items()}
+        shuffled = []
+        while any(queues.values()):
+            cal_id = rng.choice([c for c, q in queues.items() if q])
+            shuffled.append(queues[cal_id].pop(0))
+        assert build(shuffled) == in_order
+
+    rank = {cal_id: i for i, cal_id in enumerate(CAL_IDS)}
+    for data in in_order.values():
+        for group in (data['allday'], data['timed']):
+            for a, b in zip(group, group[1:]):
+                if a.start == b.start:
+                    assert rank[a.calendar_id] <= rank[b.calendar_id]
@@ -0,0 +1,66 @@
+# ==========================================
+# [테스트] 타임라인 칸 배정 (timeline_layout)
+# ==========================================
+# 예전 방식(일정마다 모든 칸을 훑기)과 칸 배정이 같은지, 넓혀도 겹치지 않는지,
+# 입력을 건드리지 않는지 확인한다. 예전 방식/겹침 검사는 benchmarks/bench_layout.py 것을 씀.
+
+import copy
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from bench_layout import check_no_overlap, make_items, scan_layout
+from timeline_layout import layout_timeline
+
+SIZES = [1, 2, 10, 100, 500]
+SEEDS = [0, 1, 7]
+
+def _touching_items():
+    # 끝나는 시각에 바로 시작하는 일정, 같은 시각에 시작하는 일정 (경계 조건)
+    rows = [(0, 60), (60, 120), (0, 30), (30, 90), (0, 120), (120, 180), (90, 95), (500, 560)]
+    return [{'summary': f"#{i}", '_s': s, '_e': e, '_dur': e - s} for i, (s, e) in enumerate(rows)]
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('n', SIZES)
+def test_lanes_match_old_scan(n, seed):
+    items = make_items(n, seed)
+    old = scan_layout(items)
+    new = layout_timeline(items)
+    assert [(id(e), lane, lanes) for e, lane, lanes in old] == [(id(p.item), p.lane, p.lanes) for p in new]
+
+def test_lanes_match_old_scan_on_touching_items():
+    items = _touching_items()
+    old = scan_layout(items)
+    new = layout_timeline(items)
+    assert [(id(e), lane, lanes) for e, lane, lanes in old] == [(id(p.item), p.lane, p.lanes) for p in new]
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('n', SIZES)
+def test_expand_never_overlaps(n, seed):
+    items = make_items(n, seed)
+    plain = layout_timeline(items)
+    expanded = layout_timeline(items, expand=True)
+    check_no_overlap(plain)
+    check_no_overlap(expanded)
+    for p, q in zip(plain, expanded):
+        # 넓혀도 칸 자체와 묶음 칸 수는 그대로, 오른쪽으로만 넓어지고 타임라인 밖으로 나가지 않음
+        assert (p.item, p.lane, p.lanes, p.left) == (q.item, q.lane, q.lanes, q.left)
+        assert q.span >= 1 and q.lane + q.span <= q.lanes
+        assert q.left + q.width <= 100 + 1e-9
+
+def test_inputs_left_unmutated():
+    items = make_items(200, 3) + _touching_items()
+    before = copy.deepcopy(items)
+    layout_timeline(items)
+    layout_timeline(items, expand=True)
+    assert items == before
+    assert all(set(item) == {'summary', '_s', '_e', '_dur'} for item in items)
+
+def test_empty_list():
+    assert layout_timeline([]) == []
+    assert layout_timeline([], expand=True) == []
@@ -0,0 +1,74 @@
+# ==========================================
+# [시온이네 일기장] 타임라인 레이아웃 엔진
+# ==========================================
+# 1. 겹치는 일정끼리 묶음(클러스터)을 만들고, 묶음 안에서 칸(lane)을 나눠 배치
+# 2. 칸 배정은 '끝나는 시간' 최소 힙 + '빈 칸 번호' 최소 힙으로 처리 (일정 n개에 O(n log n))
+#    -> 예전처럼 일정마다 모든 칸을 훑지 않음. 결과(어느 칸에 들어가는지)는 예전과 같음
+# 3. 입력 dict 는 건드리지 않고, 읽기 전용 Placement 를 돌려줌
+# 4. expand=True 면 오른쪽 칸이 그 시간 동안 비어 있을 때 옆으로 넓혀서 그림
+#
+# 입력 항목은 '_s'(시작 분), '_e'(끝 분), '_dur'(길이) 키만 있으면 됨
+
+import heapq
+from bisect import bisect_left
+from collections import namedtuple
+
+# item: 원래 입력 / lane: 칸 번호 / lanes: 묶음 전체 칸 수 / span: 차지하는 칸 수
+# width, left: 타임라인 폭 대비 % (0~100)
+Placement = namedtuple('Placement', ['item', 'lane', 'lanes', 'span', 'width', 'left'])
+
+def _clusters(items):
+    # 시작 빠른 순, 같으면 긴 것 먼저
+    sorted_items = sorted(items, key=lambda x: (x['_s'], -x['_dur']))
+    busy = []       # (끝 분, 칸 번호)
+    free = []       # 비어 있는 칸 번호
+    cluster = []    # (항목, 칸 번호)
+    lane_count = 0
+    for item in sorted_items:
+        while busy and busy[0][0] <= item['_s']:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        if not busy and cluster:
+            # 앞 묶음의 일정이 모두 끝났음 → 새 묶음 시작
+            yield cluster, lane_count
+            cluster, free, lane_count = [], [], 0
+        if free:
+            lane = heapq.heappop(free)
+        else:
+            lane = lane_count
+            lane_count += 1
+        heapq.heappush(busy, (item['_e'], lane))
+        cluster.append((item, lane))
+    if cluster:
+        yield cluster, lane_count
+
+def _free_span(lane, item, lane_intervals, lane_count):
+    # lane 오른쪽 칸들이 item 시간 동안 비어 있으면 그만큼 넓힘
+    span = 1
+    for other in range(lane + 1, lane_count):
+        starts, ends = lane_intervals[other]
+        # other 칸에서 item 이 끝나기 전에 시작하는 마지막 일정이 item 시작 뒤에 끝나면 겹침
+        idx = bisect_left(starts, item['_e']) - 1
+        if idx >= 0 and ends[idx] > item['_s']: break
+        span += 1
+    return span
+
+def layout_timeline(items, expand=False):
+    """항목들의 배치를 계산해서 Placement 목록으로 돌려준다 (묶음 → 칸 → 칸 안의 순서)."""
+    placements = []
+    for cluster, lane_count in _clusters(items):
+        by_lane = [[] for _ in range(lane_count)]
+        for item, lane in cluster:
+            by_lane[lane].append(item)
+
+        lane_intervals = None
+        if expand and lane_count > 1:
+            # 한 칸 안의 일정은 겹치지 않고 시작 순으로 들어가 있으므로 끝 시간도 정렬돼 있음
+            lane_intervals = [([it['_s'] for it in lane_items], [it['_e'] for it in lane_items])
+                              for lane_items in by_lane]
+
+        unit = 100 / lane_count
+        for lane, lane_items in enumerate(by_lane):
+            for item in lane_items:
+                span = _free_span(lane, item, lane_intervals, lane_count) if lane_intervals else 1
+                placements.append(Placement(item, lane, lane_count, span, unit * span, lane * unit))
+    return placements